@@ -0,0 +1,149 @@
+from manim import *
+import itertools
+
+import numpy as np
+
+# every assignment to a tracked mobject's points gets the next number, so a cache can tell
+# whether the points it was computed from are still the ones the mobject has without looking
+_versions = itertools.count(1)
+_tracked_classes = {}
+
+
+class TrackedPoints:
+    # mixin that track_points puts in front of a mobject's own class: its points become a
+    # property that stamps a new version on every assignment. that covers what manim does to
+    # points (shift and the rest do mob.points += ..., which assigns, and apply_points_function,
+    # interpolate, set_points and friends assign new arrays). writing into the array in place,
+    # like mob.points[:] = ..., needs invalidate_bounds(mob) afterwards
+    @property
+    def points(self):
+        return self.__dict__["_points"]
+
+    @points.setter
+    def points(self, points):
+        self.__dict__["_points"] = points
+        self.__dict__["_points_version"] = next(_versions)
+
+    # pickled as the class it had before, with plain points, so snapshots load without this
+    # module and get tracked again on first use. the versions only mean something in this process
+    def __reduce_ex__(self, protocol):
+        state = self.__dict__.copy()
+        state["points"] = state.pop("_points")
+        for name in ("_points_version", "_cached_bounds", "_cached_family_bounds"):
+            state.pop(name, None)
+        return object.__new__, (type(self).__bases__[1],), state
+
+
+def get_tracked_class(cls: type) -> type:
+    if cls not in _tracked_classes:
+        _tracked_classes[cls] = type(cls.__name__, (TrackedPoints, cls), {
+            "__module__": cls.__module__, "__qualname__": cls.__qualname__
+        })
+    return _tracked_classes[cls]
+
+# only the mobjects that are asked about get tracked, everything else keeps manim's plain
+# attribute and pays nothing for it
+def track_points(mobject: Mobject) -> Mobject:
+    if not isinstance(mobject, TrackedPoints):
+        points = mobject.__dict__.pop("points")
+        mobject.__class__ = get_tracked_class(type(mobject))
+        mobject.points = points
+    return mobject
+
+def get_points_version(mobject: Mobject) -> int:
+    return track_points(mobject).__dict__["_points_version"]
+
+def invalidate_bounds(mobject: Mobject) -> Mobject:
+    for member in mobject.get_family():
+        member.points = member.points
+    return mobject
+
+# the bounding boxes of a leaf's own points as (anchor_min, anchor_max, point_min, point_max),
+# kept on the leaf until its points get a new version. critical points of a VMobject come from
+# its anchors, width and height from all of its points, same as manim
+def get_leaf_bounds(leaf: Mobject) -> tuple:
+    version = get_points_version(leaf)
+    cached = leaf.__dict__.get("_cached_bounds")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    anchors = np.asarray(leaf.get_anchors() if isinstance(leaf, VMobject) else leaf.points).reshape(-1, leaf.dim)
+    if len(anchors):
+        anchor_min, anchor_max = anchors.min(0), anchors.max(0)
+    else:
+        # a few stray points without a full curve have no anchors
+        anchor_min, anchor_max = np.full(leaf.dim, np.inf), np.full(leaf.dim, -np.inf)
+    bounds = (anchor_min, anchor_max, leaf.points.min(0), leaf.points.max(0))
+    leaf._cached_bounds = (version, bounds)
+    return bounds
+
+
+class CachedBounds:
+    # mixin for a Mobject: its critical points, coordinates, width and height come from cached
+    # bounding boxes instead of from all of the family's points. checking a cache costs an integer
+    # compare per family member, a box is only recomputed for a leaf whose points were assigned
+    # since, and the combined box only when one of them was or the family changed. the family
+    # gets its points tracked the first time it's asked
+    def get_family_bounds(self) -> tuple:
+        # (anchor_min, anchor_max, point_min, point_max) over the family, None without anchors
+        members, key = [], []
+        stack = [self]
+        while stack:
+            mob = stack.pop()
+            members.append(mob)
+            key.append((id(mob), get_points_version(mob)))
+            stack.extend(mob.submobjects)
+        cached = self.__dict__.get("_cached_family_bounds")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        bounds = self.combine_bounds(members)
+        self._cached_family_bounds = (key, bounds)
+        return bounds
+
+    @staticmethod
+    def combine_bounds(members: list) -> tuple:
+        boxes, empty_leaves = [], False
+        for mob in members:
+            if len(mob.points):
+                boxes.append(get_leaf_bounds(mob))
+            elif not mob.submobjects:
+                empty_leaves = True
+        if not boxes:
+            return None
+        anchor_min, anchor_max, point_min, point_max = (np.array(corner) for corner in zip(*boxes))
+        anchor_min, anchor_max = anchor_min.min(0), anchor_max.max(0)
+        if np.isinf(anchor_min[0]):
+            return None
+        point_min, point_max = point_min.min(0), point_max.max(0)
+        # manim's width and height count an empty leaf as a point at 0
+        if empty_leaves:
+            point_min, point_max = np.minimum(point_min, 0), np.maximum(point_max, 0)
+        return anchor_min, anchor_max, point_min, point_max
+
+    def get_critical_point(self, direction: np.ndarray) -> np.ndarray:
+        bounds = self.get_family_bounds()
+        if bounds is None:
+            return np.zeros(self.dim)
+        low, high = bounds[0], bounds[1]
+        direction = np.asarray(direction)[:self.dim]
+        return np.where(direction < 0, low, np.where(direction > 0, high, (low + high) / 2))
+
+    def get_extremum_along_dim(self, points: np.ndarray = None, dim: int = 0, key: int = 0):
+        bounds = self.get_family_bounds() if points is None else None
+        if bounds is None:
+            return super().get_extremum_along_dim(points, dim, key)
+        low, high = bounds[0][dim], bounds[1][dim]
+        if key < 0:
+            return low
+        elif key == 0:
+            return (low + high) / 2
+        return high
+
+    def length_over_dim(self, dim: int) -> float:
+        bounds = self.get_family_bounds()
+        if bounds is None:
+            return super().length_over_dim(dim)
+        return bounds[3][dim] - bounds[2][dim]
+
+
+class BoundedVGroup(CachedBounds, VGroup):
+    pass
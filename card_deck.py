@@ -0,0 +1,55 @@
+import numpy as np
+from pathlib import Path
+from typing import Iterable, Sequence
+
+RED = 0
+BLACK = 1
+
+
+class CardDeck:
+    # colors of the cards by position, colors[k - 1] is b_k (1 if the card is black, 0 if it's red)
+    def __init__(self, colors: Sequence[int]):
+        self.colors = np.asarray(colors, dtype=np.uint8)
+        if np.any(self.colors > BLACK):
+            raise ValueError("card colors must be 0 (red) or 1 (black)")
+
+    # the first letter of the svg file name is the card's color, same as in the "SVG Cards" folder
+    @classmethod
+    def from_paths(cls, paths: Iterable[Path]) -> "CardDeck":
+        return cls([BLACK if Path(p).name[:1] == 'B' else RED for p in paths])
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    @property
+    def mask(self) -> int:
+        # bit k - 1 is set when the card at position k is black
+        return int.from_bytes(np.packbits(self.colors, bitorder="little").tobytes(), "little")
+
+    def b(self, k: int) -> int:
+        return int(self.colors[k - 1])
+
+    def is_br_inversion(self, i: int, j: int) -> bool:
+        return bool(self.colors[i - 1] == BLACK and self.colors[j - 1] == RED)
+
+    def is_bb_pair(self, i: int, j: int) -> bool:
+        return bool(self.colors[i - 1] == BLACK and self.colors[j - 1] == BLACK)
+
+    # the card at position i moves to position mappings[i], same convention as shuffle_cards
+    def shuffle(self, mappings: Sequence[int]) -> "CardDeck":
+        shuffled = np.empty_like(self.colors)
+        shuffled[np.asarray(mappings)] = self.colors
+        self.colors = shuffled
+        return self
+
+    # sum over j < i of b_i(1 - b_j): every black card counts the red cards in front of it
+    def br_inversions(self) -> int:
+        b = self.colors.astype(np.int64)
+        reds_before = np.cumsum(1 - b) - (1 - b)
+        return int(b @ reds_before)
+
+    # sum over j < i of b_i b_j: every black card counts the black cards in front of it
+    def bb_pairs(self) -> int:
+        b = self.colors.astype(np.int64)
+        blacks_before = np.cumsum(b) - b
+        return int(b @ blacks_before)
@@ -0,0 +1,155 @@
+from manim import *
+import hashlib
+import os
+from typing import Sequence
+
+import numpy as np
+
+from translate import Translate
+
+# rasterized cards by shape and style, shared by every card that looks the same
+_sprites = {}
+
+
+# opt in with CSP_SPRITES, the sprites are resampled bitmaps and can be a little softer than vectors
+def sprites_enabled() -> bool:
+    return bool(os.environ.get("CSP_SPRITES")) and config.renderer == RendererType.CAIRO
+
+def get_sprite_key(mobject: Mobject) -> str:
+    digest = hashlib.sha1()
+    center = mobject.get_center()
+    for mob in mobject.family_members_with_points():
+        digest.update(np.round(mob.points - center, 4).tobytes())
+        for array in (mob.get_fill_rgbas(), mob.get_stroke_rgbas()):
+            digest.update(np.asarray(array).tobytes())
+        digest.update(repr(mob.get_stroke_width()).encode())
+    digest.update(repr((config.pixel_width, config.frame_width)).encode())
+    return digest.hexdigest()
+
+# draws the mobject on its own transparent canvas at the pixel density of the output video
+def rasterize(mobject: Mobject, padding: float = 0.05) -> ImageMobject:
+    pixels_per_unit = config.pixel_width / config.frame_width
+    pixel_width = int(np.ceil((mobject.width + 2 * padding) * pixels_per_unit))
+    pixel_height = int(np.ceil((mobject.height + 2 * padding) * pixels_per_unit))
+    camera = Camera(
+        frame_center=mobject.get_center(),
+        pixel_width=pixel_width, pixel_height=pixel_height,
+        frame_width=pixel_width / pixels_per_unit, frame_height=pixel_height / pixels_per_unit,
+        background_opacity=0,
+    )
+    camera.capture_mobject(mobject)
+
+    # cairo leaves the edges premultiplied by their alpha, images are drawn with straight alpha
+    pixels = camera.pixel_array.astype(np.float64)
+    alpha = pixels[:, :, 3:]
+    pixels[:, :, :3] = np.where(alpha > 0, pixels[:, :, :3] * 255 / np.maximum(alpha, 1), 0)
+    sprite = ImageMobject(np.clip(pixels, 0, 255).astype(np.uint8))
+    sprite.height = pixel_height / pixels_per_unit
+    return sprite.move_to(mobject.get_center())
+
+def get_sprite(mobject: Mobject, scale_factor: float = 1) -> ImageMobject:
+    # rasterized at the largest size it's going to be shown at, so it only ever gets scaled down
+    source = mobject if scale_factor <= 1 else mobject.copy().scale(scale_factor)
+    key = get_sprite_key(source)
+    if key not in _sprites:
+        _sprites[key] = rasterize(source)
+    sprite = _sprites[key].copy()
+    sprite.scale(mobject.height / source.height).move_to(mobject.get_center())
+    return sprite
+
+# the (center, scale factor) that takes mobject to target, None if target isn't a moved and
+# uniformly scaled copy of mobject with the same style
+def get_similarity(mobject: Mobject, target: Mobject, atol: float = 1e-6) -> tuple:
+    members = mobject.family_members_with_points()
+    target_members = target.family_members_with_points()
+    if len(members) != len(target_members) or not members:
+        return None
+    for mob, target_mob in zip(members, target_members):
+        if mob.points.shape != target_mob.points.shape:
+            return None
+        if isinstance(mob, VMobject) and not (
+            np.array_equal(mob.get_fill_rgbas(), target_mob.get_fill_rgbas())
+            and np.array_equal(mob.get_stroke_rgbas(), target_mob.get_stroke_rgbas())
+        ):
+            return None
+
+    points = np.concatenate([mob.points for mob in members]) - mobject.get_center()
+    target_points = np.concatenate([mob.points for mob in target_members]) - target.get_center()
+    size = np.linalg.norm(points)
+    if size == 0:
+        return None
+    scale_factor = np.linalg.norm(target_points) / size
+    if not np.allclose(target_points, scale_factor * points, atol=atol):
+        return None
+    return target.get_center(), scale_factor
+
+
+class SpriteMove(Animation):
+    # moves and uniformly scales a bitmap of a mobject, then puts the vectors where it ended up.
+    # the sprite is the animation's own mobject, added to the scene with the others before the
+    # scene works out what moves, and the mobject's points are set aside until the clean up so
+    # its vectors draw nothing in the meantime. it stays where it is in its groups all along
+    def __init__(
+        self,
+        mobject: Mobject,
+        target_center: np.ndarray,
+        scale_factor: float = 1,
+        path_arc: float = 0,
+        **kwargs
+    ):
+        super().__init__(get_sprite(mobject, scale_factor), remover=True, **kwargs)
+        self.vectors = mobject
+        self.target_center = np.array(target_center, dtype=float)
+        self.scale_factor = scale_factor
+        self.path_func = path_along_arc(path_arc)
+
+    def create_starting_mobject(self) -> Mobject:
+        return self.mobject
+
+    def begin(self) -> None:
+        self.start_center = self.vectors.get_center()
+        self.start_height = self.mobject.height
+        self.hidden = [(mob, mob.points) for mob in self.vectors.family_members_with_points()]
+        for mob, _ in self.hidden:
+            mob.points = np.zeros((0, mob.dim))
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha)
+        height = self.start_height * interpolate(1, self.scale_factor, t)
+        self.mobject.scale(height / self.mobject.height)
+        self.mobject.move_to(self.path_func(self.start_center, self.target_center, t))
+
+    def clean_up_from_scene(self, scene: Scene) -> None:
+        super().clean_up_from_scene(scene)
+        for mob, points in self.hidden:
+            mob.points = points
+        self.vectors.scale(self.scale_factor).move_to(self.target_center)
+
+
+# the animations csp.py uses to move cards, as sprites when they're enabled and as in-place
+# translations otherwise
+
+def move_card(card: Mobject, point: np.ndarray, **kwargs) -> Animation:
+    move = SpriteMove if sprites_enabled() else Translate
+    return move(card, point, **kwargs)
+
+def swap_cards(card_a: Mobject, card_b: Mobject) -> Animation:
+    # Swap moves both cards along the same 90 degree arc
+    return AnimationGroup(
+        move_card(card_a, card_b.get_center(), path_arc=90 * DEGREES),
+        move_card(card_b, card_a.get_center(), path_arc=90 * DEGREES),
+    )
+
+# one sprite per card that only moves and scales, a vector Transform for the rest
+def transform_cards(cards: Sequence[Mobject], targets: Sequence[Mobject]) -> list:
+    if not sprites_enabled():
+        return [Transform(cards, targets)]
+    animations = []
+    for card, target in zip(cards, targets):
+        similarity = get_similarity(card, target)
+        if similarity is None:
+            animations.append(Transform(card, target))
+        else:
+            animations.append(SpriteMove(card, *similarity))
+    return animations
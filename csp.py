@@ -1,148 +1,255 @@
 from manim import *
 from pathlib import Path
 from transform_by_glyph_map import TransformByGlyphMap
+from glyph_counter import GlyphCounter
+from glyph_table import GlyphTable
+from cached_bounds import BoundedVGroup
+from lazy_updaters import add_lazy_updater
+from card_deck import CardDeck
+from svg_cache import load_svg
+from card_sprites import move_card, swap_cards, transform_cards
+from sectioned_scene import SectionedScene
+from scene_profiler import SceneProfiler
+from scene_pruner import ScenePruner
+from static_frames import StaticFrameScene
+from draft_mode import DraftMixin
+from tex_precompile import TexPrecompiler
+from permutation import Permutation
+from csp_logic import BR_SHUFFLE, BB_SHUFFLE, check_variant, get_example_swap, running_counts, sweep_rows
+from math import comb
 from typing import Sequence, Callable
 
-# accesses the SVGMobject at the specified index to determine if it's black or not
-def get_b_k(cards: VGroup, k: int) -> int:
-    if cards[k - 1][1].get_file_path().name[:1] == 'B':
-        return 1
-    return 0
-
-def isBRInversion(cards: VGroup, i: int, j: int) -> bool:
-    return get_b_k(cards, i) * (1 - get_b_k(cards, j)) == 1
-
-def isBBPair(cards: VGroup, i: int, j: int) -> bool:
-    return get_b_k(cards, i) * get_b_k(cards, j) == 1
-
-def shuffle_cards(self, cards: VGroup, mappings: list) -> None:
+# looks up the color of the card at the specified position in the deck model
+def get_b_k(deck: CardDeck, k: int) -> int:
+    return deck.b(k)
+
+def isBRInversion(deck: CardDeck, i: int, j: int) -> bool:
+    return deck.is_br_inversion(i, j)
+
+def isBBPair(deck: CardDeck, i: int, j: int) -> bool:
+    return deck.is_bb_pair(i, j)
+
+# a card is its face design on a white rounded rectangle, the face comes from the svg cache.
+# cards get positioned against over and over, so they keep their bounding boxes cached
+def make_card(file_name: Path) -> VGroup:
+    card_mob = load_svg(file_name, stroke_width=0)
+    rect = RoundedRectangle(corner_radius=0.3, 
+                            width=card_mob.width + 0.4, height=card_mob.height + 0.5,
+                            fill_color=WHITE, fill_opacity=1,
+                            stroke_width=0)
+    return BoundedVGroup(rect, card_mob)
+
+# plays one move for all the shuffles together, the card at position i ends up where the
+# composed permutation sends it
+def shuffle_cards(self, cards: VGroup, *shuffles: Permutation, deck: CardDeck = None) -> Permutation:
+    permutation = Permutation.compose(*shuffles)
+    if permutation.is_identity():
+        return permutation
+    positions = [card.get_center() for card in cards]
     self.play(
-        *[cards[i].animate.move_to(cards[mappings[i]].get_center()) for i in range(8)]
+        *[move_card(cards[i], positions[permutation[i]]) for i in permutation.moved()]
     )
-    result = [None] * len(cards.submobjects)
-    for i, new_index in enumerate(mappings):
-        result[new_index] = cards[i]
-    for i in range(len(result)):
-        cards[i] = result[i]
+    cards.submobjects = permutation.apply(cards.submobjects)
+    # keeps the colors in sync with the new order of the cards
+    if deck is not None:
+        deck.shuffle(permutation)
+    return permutation
 
 def create_table(table: Sequence[Sequence[int]], col_labels: Sequence[int]) -> VGroup:
-    int_table = IntegerTable(
+    int_table = GlyphTable(
         table, col_labels=col_labels,
         line_config={"stroke_width": 2}
     ).scale(0.55)
-    int_table.remove(*int_table.get_vertical_lines())
     BB_table_labels = int_table.get_labels()
     for label in BB_table_labels:
         label.set_color(YELLOW).scale(1.1)
 
-    rects = VGroup(
-        *[SurroundingRectangle(int_table.get_rows()[i], buff=0.15, stroke_width=2) for i in range(1, len(int_table.get_rows()))]
-    )
+    rects = int_table.get_row_rects(stroke_width=2)
 
     return VGroup(int_table, rects)
 
+class CardPointer(VGroup):
+    # the i/j labels: an arrow pointing down at a card label, or up at a card from below
+    def __init__(self, tex: str, *colors):
+        super().__init__(MathTex(tex), Arrow(start=ORIGIN, end=DOWN))
+        self.arrange(DOWN, buff=0.1).scale(0.6).set_color_by_gradient(*colors)
+        self.colors = colors
+        self.from_below = False
+
+    # cards in the top half of the grid are pointed at from above their label, the rest from below
+    def point_at(self, k: int, cards: VGroup, card_labels: VGroup, rows: int, cols: int) -> "CardPointer":
+        from_below = k // cols >= (rows + 1) // 2
+        if from_below != self.from_below:
+            self[1].rotate(PI)
+            self.arrange(UP if from_below else DOWN, buff=0.1)
+            self.from_below = from_below
+        if from_below:
+            self.next_to(cards[k], DOWN, buff=0.1)
+        else:
+            self.next_to(card_labels[k], UP, buff=0.1)
+        return self
+
+    def highlight(self, on: bool) -> "CardPointer":
+        if on:
+            return self.set_color(YELLOW)
+        return self.set_color_by_gradient(*self.colors)
+
+
+class SweepRow(Animation):
+    # plays one i-row of iterate_through_cards as a single animation: the j pointer steps
+    # through the cards in front of i and the counter goes up on every pair that counts
+    def __init__(self, j_label: CardPointer, hits: Sequence[bool], sum_tracker: ValueTracker,
+                 place: Callable[[int], None], **kwargs):
+        super().__init__(j_label, rate_func=linear, **kwargs)
+        self.hits = hits
+        self.sum_tracker = sum_tracker
+        self.place = place
+
+    def begin(self) -> None:
+        self.counts = running_counts(self.hits, int(self.sum_tracker.get_value()))
+        self.current_j = None
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        j = min(int(alpha * len(self.hits)), len(self.hits) - 1)
+        if j == self.current_j:
+            return
+        self.current_j = j
+        self.place(j)
+        self.mobject.highlight(self.hits[j])
+        self.sum_tracker.set_value(self.counts[j])
+
+    def finish(self) -> None:
+        super().finish()
+        self.mobject.highlight(False)
+
+
+# goes through every pair j < i of the deck in order, adding 1 to the sum_tracker whenever
+# expression_func(deck, i, j) holds. the pairs and hits come from csp_logic.sweep_rows, the
+# same ones the logic check counts. batched plays each i-row as one animation instead of one
+# wait per pair, and total_duration spreads the whole sweep over a fixed amount of time
 def iterate_through_cards(
-        self, expression_func: Callable[[VGroup, int, int], bool], cards: VGroup, \
-        card_labels: VGroup, expression_tex: MathTex, sum_tracker: ValueTracker
+        self, expression_func: Callable[[CardDeck, int, int], bool], cards: VGroup, \
+        deck: CardDeck, card_labels: VGroup, sum_tracker: ValueTracker,
+        rows: int = 2, batched: bool = False, total_duration: float = None
 ) -> Sequence[Animation]:
-    
-    i_label = VGroup(MathTex("i"), Arrow(start=ORIGIN, end=DOWN)
-    ).arrange(DOWN, buff=0.1).scale(0.6).next_to(card_labels[1], UP, buff=0.1
-    ).set_color_by_gradient(RED, YELLOW_E)
-    j_label = VGroup(MathTex("j"), Arrow(start=ORIGIN, end=DOWN)
-    ).arrange(DOWN, buff=0.1).scale(0.6).next_to(card_labels[0], UP, buff=0.1
-    ).set_color_by_gradient(BLUE_D, TEAL_D)
-
-    create_arrows = [Create(i_label), Create(j_label)]
+
+    n = len(cards)
+    cols = -(-n // rows)
+    # the original pacing was 0.2 seconds per pair
+    pair_time = 0.2 if total_duration is None else total_duration / (n * (n - 1) // 2)
+
+    def place(label: CardPointer, k: int) -> None:
+        label.point_at(k, cards, card_labels, rows, cols)
+
+    i_label = CardPointer("i", RED, YELLOW_E)
+    j_label = CardPointer("j", BLUE_D, TEAL_D)
+    place(i_label, 1)
+    place(j_label, 0)
+
+    sweep = sweep_rows(deck, expression_func)
     # fence post case for starting position
-    if(expression_func(cards, 2, 1)):
-        expression_tex_equals_1 = MathTex(
-            expression_tex.get_tex_string()[:-1] + "1"
-        ).match_x(expression_tex)
-        create_arrows.append(ReplacementTransform(expression_tex, expression_tex_equals_1))
+    _, fence_post = next(sweep)
+    if(fence_post[0]):
         sum_tracker.increment_value(1)
-        self.play(*create_arrows)
-        self.replace(expression_tex_equals_1, expression_tex)
-    else:
-        self.play(*create_arrows)
-    self.wait(0.2)
+    self.play(Create(i_label), Create(j_label))
+    self.wait(pair_time)
     
-    for i in range(2, 8):
-        if i <= 3:
-            i_label.next_to(card_labels[i], UP, buff=0.1)
-        else:
-            if i == 4:
-                i_label[1].rotate(PI)
-                i_label.arrange(UP, buff=0.1)
-            i_label.next_to(cards[i], DOWN, buff=0.1)
+    for i, hits in sweep:
+        place(i_label, i - 1)
         self.add(i_label)
 
-        for j in range(i):
-            if j <= 3:
-                j_label.next_to(card_labels[j], UP, buff=0.1)
-            else:
-                if j == 4:
-                    j_label[1].rotate(PI)
-                    j_label.arrange(UP, buff=0.1)
-                j_label.next_to(cards[j], DOWN, buff=0.1)
-            self.add(j_label)
-
-            if(expression_func(cards, i + 1, j + 1)):
-                self.play(sum_tracker.animate.increment_value(1), run_time=0.01)
-            self.wait(0.2)
+        if batched:
+            self.play(SweepRow(
+                j_label, hits, sum_tracker, lambda j: place(j_label, j), run_time=pair_time * len(hits)
+            ))
+        else:
+            for j, hit in enumerate(hits):
+                place(j_label, j)
+                self.add(j_label)
+
+                if(hit):
+                    self.play(sum_tracker.animate.increment_value(1), run_time=0.01)
+                self.wait(pair_time)
         
-        if(j != 6):
-            if(i >= 5):
-                j_label[1].rotate(PI)
-            j_label.arrange(DOWN, buff=0.1)
-            j_label.next_to(card_labels[0], UP, buff=0.1)
+        if(i != n):
+            place(j_label, 0)
 
     return [Uncreate(i_label), Uncreate(j_label)]
 
 
-class CSP(Scene):
+class CSP(DraftMixin, SceneProfiler, ScenePruner, TexPrecompiler, StaticFrameScene, SectionedScene):
+    sections = [
+        "setup_scene", "definitions", "br_table", "first_sum",
+        "bb_table", "mod_2_reduction", "even_expansion"
+    ]
+
+    # a variant of the video is a subclass that changes these: the svg files of the deck in its
+    # solved order (None for everything in "SVG Cards"), the two shuffles and the rows of the grid
+    card_files = None
+    br_shuffle = BR_SHUFFLE
+    bb_shuffle = BB_SHUFFLE
+    grid_rows = 2
+    section_parameters = {
+        "setup_scene": ("card_files", "grid_rows"),
+        "first_sum": ("br_shuffle",),
+        "bb_table": ("bb_shuffle",),
+    }
+
+    @classmethod
+    def get_card_files(cls) -> Sequence[Path]:
+        folder = Path("SVG Cards")
+        if cls.card_files is None:
+            return sorted(folder.glob("*.svg"))
+        return [folder / name for name in cls.card_files]
+
+    @classmethod
+    def check_parameters(cls) -> None:
+        check_variant(CardDeck.from_paths(cls.get_card_files()), cls.br_shuffle, cls.bb_shuffle)
+
+    def setup(self):
+        self.check_parameters()
+        super().setup()
 
-    def construct(self):
+    def setup_scene(self):
 
         ###---Setting up scene---###
         self.camera.background_color = GRAY_E
 
 
         ###---Putting all the SVG Cards into a VGroup---###
-        folder = Path("SVG Cards")
-        SVG_cards = sorted(
-            p for p in folder.glob("*.svg")
-        )
+        SVG_cards = self.get_card_files()
 
-        cards = VGroup()
-        for card in SVG_cards:
-            card_mob = SVGMobject(file_name=card, stroke_width=0)
-            rect = RoundedRectangle(corner_radius=0.3, 
-                                    width=card_mob.width + 0.4, height=card_mob.height + 0.5,
-                                    fill_color=WHITE, fill_opacity=1,
-                                    stroke_width=0)
-            cards.add(VGroup(rect, card_mob))
+        cards = BoundedVGroup(*[make_card(card) for card in SVG_cards])
+        deck = CardDeck.from_paths(SVG_cards)
 
-        cards.arrange_in_grid(rows=2, cols=4, buff=(MED_SMALL_BUFF, LARGE_BUFF))
+        rows = self.grid_rows
+        cards.arrange_in_grid(rows=rows, cols=-(-len(cards) // rows), buff=(MED_SMALL_BUFF, LARGE_BUFF))
         
         self.play(FadeIn(cards))
         self.wait(10)
 
 
         ###---Labels all of the cards---###
-        card_labels = VGroup()
-        for i in range(8):
+        card_labels = BoundedVGroup()
+        for i in range(len(cards)):
             label = Tex(i+1).next_to(cards[i], UP)
             card_labels.add(label)
 
         self.play(ShowIncreasingSubsets(card_labels), run_time=1.5, rate_func=linear)
         self.wait(1)
-        self.play(AnimationGroup(*[Indicate(card_labels[i]) for i in range(8)], lag_ratio=0.5))
+        self.play(AnimationGroup(*[Indicate(card_labels[i]) for i in range(len(cards))], lag_ratio=0.5))
         self.wait(1)
 
+        self.cards, self.deck, self.card_labels = cards, deck, card_labels
+
+    def definitions(self):
+        cards, deck, card_labels = self.cards, self.deck, self.card_labels
+        n = len(cards)
 
         ###---Creating definitions and setting boundaries---###
-        self.play(VGroup(cards, card_labels).animate.scale(0.5).to_edge(LEFT, buff=0.5))
+        target = VGroup(cards, card_labels).copy().scale(0.5).to_edge(LEFT, buff=0.5)
+        self.play(*transform_cards(cards, target[0]), Transform(card_labels, target[1]))
         b_k = MathTex(r"b_k", r"= \begin{cases} 1 & \text{card at position $k$ is black} \\ 0 & \text{card at position $k$ is red} \end{cases}"
                       ).to_edge(RIGHT)
         
@@ -151,11 +258,11 @@ class CSP(Scene):
         self.play(Write(b_k[1]))
         self.wait(9)
 
-        b_3 = MathTex("b_3 = 1").next_to(card_labels[3], UP, buff=0.5)
+        b_3 = MathTex(f"b_3 = {deck.b(3)}").next_to(card_labels[3], UP, buff=0.5)
         b_3_arrow = CurvedArrow(b_3.get_corner(DL) + [0, -0.1, 0], cards[2].get_center() + [0, 0.25, 0], 
                                 angle=-PI/4, stroke_color=BLUE_D, stroke_width=6)
-        b_5 = MathTex("b_5 = 0").next_to(cards[7], DOWN, buff=0.75)
-        b_5_arrow = CurvedArrow(b_5.get_corner(UL) + [-0.1, 0.1, 0], cards[6].get_center() - [0, 0.25, 0], 
+        b_5 = MathTex(f"b_5 = {deck.b(5)}").next_to(cards[-1], DOWN, buff=0.75)
+        b_5_arrow = CurvedArrow(b_5.get_corner(UL) + [-0.1, 0.1, 0], cards[-2].get_center() - [0, 0.25, 0], 
                                 angle=-PI/4, stroke_color=BLUE_D, stroke_width=6)
 
         self.play(Create(VGroup(b_3, b_3_arrow)))
@@ -166,10 +273,10 @@ class CSP(Scene):
         self.wait(2)
 
         i_and_j = VGroup(
-            MathTex(r"1 \leq i \leq 8"),
-            MathTex(r"1 \leq j \leq 8"),
+            MathTex(f"1 \\leq i \\leq {n}"),
+            MathTex(f"1 \\leq j \\leq {n}"),
             MathTex(r"\Downarrow").scale(1.5),
-            MathTex(r"1 \le j < i \le 8")
+            MathTex(f"1 \\le j < i \\le {n}")
         ).arrange(DOWN).to_edge(DOWN, buff=1.5).match_x(b_k)
         self.play(AnimationGroup(
             b_k.animate.to_edge(UP, buff=1.5), Write(i_and_j[0]), Write(i_and_j[1]),
@@ -212,10 +319,17 @@ class CSP(Scene):
         one_minus_b_j = MathTex(r"1-b_j = \begin{cases} 0 & \text{card at position $j$ is black} \\ 1 & \text{card at position $j$ is red} \end{cases}"
         ).match_y(b_j).match_height(b_j).align_to(b_j, LEFT)
         self.play(TransformByGlyphMap(b_j, one_minus_b_j, 
-            ([], [0]), ([], [1]), *[([i], [i + 2]) for i in range(48)]
+            ([], [0]), ([], [1]), *[([i], [i + 2]) for i in range(48)], fused=True
         ))
         self.wait(9)
 
+        self.b_k, self.i_and_j, self.starting_expression = b_k, i_and_j, starting_expression
+        self.b_i, self.one_minus_b_j = b_i, one_minus_b_j
+
+    def br_table(self):
+        cards, deck, i_and_j, starting_expression = self.cards, self.deck, self.i_and_j, self.starting_expression
+        b_i, one_minus_b_j = self.b_i, self.one_minus_b_j
+
         BR_table = create_table([[0, 0, 0],
                                 [0, 1, 0],
                                 [1, 0, 1],
@@ -243,11 +357,13 @@ class CSP(Scene):
         ))
         self.wait(1.5)
         self.play(Indicate(i_and_j[3]), run_time=1.5)
-        self.play(Swap(cards[3], cards[4]))
+        # a black card followed by a red one, swapped into a BR inversion
+        k = get_example_swap(deck)
+        self.play(swap_cards(cards[k - 1], cards[k]))
         self.wait(0.5)
 
         example_inversion = VGroup(
-            MathTex(r"b_5\left(1-b_4\right)").match_x(starting_expression),
+            MathTex(f"b_{k + 1}\\left(1-b_{k}\\right)").match_x(starting_expression),
             MathTex(r"1\left(1-0\right) = 1").match_x(starting_expression)
         )
         example_inversion_arrow = CurvedArrow(
@@ -272,16 +388,22 @@ class CSP(Scene):
             AnimationGroup(
                 AnimationGroup(
                     ShrinkToCenter(
-                        VGroup(example_inversion_arrow, example_inversion)), Swap(cards[3], cards[4]
+                        VGroup(example_inversion_arrow, example_inversion)), swap_cards(cards[k - 1], cards[k]
                     )
                 ), starting_expression.animate.set_y(0), lag_ratio=0.5
             )
         )  
         self.wait(15)
 
+        self.starting_expression = starting_expression
+
+    def first_sum(self):
+        cards, deck, card_labels = self.cards, self.deck, self.card_labels
+        starting_expression = self.starting_expression
+        n = len(cards)
 
         ###---Turning it into a sum---###
-        starting_sum = MathTex(r"\sum_{i=1}^{8} \sum_{j=1}^{i-1} b_i \left(1-b_j\right)"
+        starting_sum = MathTex(f"\\sum_{{i=1}}^{{{n}}} \\sum_{{j=1}}^{{i-1}} b_i \\left(1-b_j\\right)"
                                ).match_x(starting_expression) 
         starting_expression_temp = MathTex(
             r"b_i\left(1-b_j\right)"
@@ -296,38 +418,48 @@ class CSP(Scene):
         
         sum_tracker = ValueTracker(0)
         starting_sum_equals_0_temp = MathTex(
-            f"\\sum_{{i=1}}^{{8}} \\sum_{{j=1}}^{{i-1}} b_i \\left(1-b_j\\right) = 0"
+            f"\\sum_{{i=1}}^{{{n}}} \\sum_{{j=1}}^{{i-1}} b_i \\left(1-b_j\\right) = 0"
         ).match_x(starting_sum)
         self.play(TransformByGlyphMap(
             starting_sum, starting_sum_equals_0_temp,
             *[([i], [i]) for i in range(20)], ([],[20]), ([],[21])
         ))
         
-        starting_sum_equals_0 = always_redraw(lambda: MathTex(
-            f"\\sum_{{i=1}}^{{8}} \\sum_{{j=1}}^{{i-1}} b_i \\left(1-b_j\\right) = {int(sum_tracker.get_value())}"
-        ).match_x(starting_sum_equals_0_temp))
+        starting_sum_equals_0 = GlyphCounter(
+            f"\\sum_{{i=1}}^{{{n}}} \\sum_{{j=1}}^{{i-1}} b_i \\left(1-b_j\\right) = ", sum_tracker
+        ).match_x(starting_sum_equals_0_temp)
         #for some reason doing self.replace() doesn't work, so I just made it a very short animation
         self.play(ReplacementTransform(starting_sum_equals_0_temp, starting_sum_equals_0, run_time=0.01))
 
         # shuffles the cards "randomly"
-        shuffle_cards(self, cards, [4, 6, 5, 1, 3, 0, 7, 2])
+        shuffle_cards(self, cards, self.br_shuffle, deck=deck)
 
-        uncreation = iterate_through_cards(self, isBRInversion, cards, card_labels, 
-                                           starting_sum_equals_0, sum_tracker)
+        uncreation = iterate_through_cards(self, isBRInversion, cards, deck, card_labels, sum_tracker,
+                                           rows=self.grid_rows)
+        # the "=" and however many digits the count ended up with
         uncreation.append(
             TransformByGlyphMap(starting_sum_equals_0, starting_sum,
-            *[([i], [i]) for i in range(20)], ([20],[]), ([21],[]), ([22],[]))
+            *[([i], [i]) for i in range(20)], *[([i], []) for i in range(20, len(starting_sum_equals_0[0]))])
         )
         self.wait(1)
         
         self.play(*uncreation)
         
         # returns the cards back to the solved state
-        shuffle_cards(self, cards, [5, 3, 7, 4, 0, 2, 1, 6])
+        shuffle_cards(self, cards, self.br_shuffle.inverse(), deck=deck)
+
 
+        self.starting_sum = starting_sum
+
+    def bb_table(self):
+        cards, deck, card_labels, b_k = self.cards, self.deck, self.card_labels, self.b_k
+        starting_sum = self.starting_sum
+        n, blacks = len(cards), int(deck.colors.sum())
+        bb_pairs = comb(blacks, 2)
+        sum_tex = f"\\sum_{{i=1}}^{{{n}}} \\sum_{{j=1}}^{{i-1}}"
 
         ###---Rearranging the expression---###
-        distribute_b_i = MathTex(r"\sum_{i=1}^{8} \sum_{j=1}^{i-1} b_i-b_i b_j"
+        distribute_b_i = MathTex(sum_tex + r" b_i-b_i b_j"
                                 ).match_x(starting_sum)
         self.play(TransformByGlyphMap(
             starting_sum, distribute_b_i, 
@@ -336,16 +468,16 @@ class CSP(Scene):
         ))
         
         og_split_into_separate_sums = MathTex(
-            r"\sum_{i=1}^{8} \sum_{j=1}^{i-1} b_i- \sum_{i=1}^{8} \sum_{j=1}^{i-1}b_i b_j"
+            sum_tex + r" b_i- " + sum_tex + r"b_i b_j"
         ).match_x(distribute_b_i)
         og_split_into_separate_sums.save_state()
         self.play(TransformByGlyphMap(
             distribute_b_i, og_split_into_separate_sums,
             *[([i], [i,i+15]) for i in range(12)], ([12,13],[12,13]), ([14],[14]), 
-            ([15,16],[27,28]), ([17,18],[29,30])
+            ([15,16],[27,28]), ([17,18],[29,30]), fused=True
         ))
         split_into_separate_sums_temp = MathTex(
-            r"\sum_{i=1}^{8} \sum_{j=1}^{i-1} b_i-", r"\sum_{i=1}^{8} \sum_{j=1}^{i-1}b_i b_j"
+            sum_tex + r" b_i-", sum_tex + r"b_i b_j"
         ).match_x(og_split_into_separate_sums)
         #for some reason doing self.replace() doesn't work, so I just made it a very short animation
         self.play(ReplacementTransform(
@@ -383,7 +515,7 @@ class CSP(Scene):
 
         sum_tracker = ValueTracker(0)
         second_term = MathTex(
-            f"\\sum_{{i=1}}^{{8}} \\sum_{{j=1}}^{{i-1}} b_i b_j"
+            sum_tex + r" b_i b_j"
         ).match_x(split_into_separate_sums[1])
         self.replace(split_into_separate_sums[1], second_term)
         second_term_equals_0_temp = MathTex(
@@ -394,22 +526,22 @@ class CSP(Scene):
             *[([i], [i]) for i in range(16)], ([],[16]), ([],[17])
         ))
     
-        second_term_equals_0 = always_redraw(lambda: MathTex(
-            f"\\sum_{{i=1}}^{{8}} \\sum_{{j=1}}^{{i-1}} b_i b_j = {int(sum_tracker.get_value())}"
-        ).match_x(second_term_equals_0_temp))
+        second_term_equals_0 = GlyphCounter(
+            sum_tex + r" b_i b_j = ", sum_tracker
+        ).match_x(second_term_equals_0_temp)
         # for some reason doing self.replace() doesn't work, so I just made it a very short animation
         self.play(ReplacementTransform(second_term_equals_0_temp, second_term_equals_0, run_time=0.01))
 
         # shuffles the cards "randomly"
-        shuffle_cards(self, cards, [6, 2, 5, 0, 7, 3, 1, 4])
-        uncreation = iterate_through_cards(self, isBBPair, cards, card_labels, 
-                                           second_term_equals_0, sum_tracker)
+        shuffle_cards(self, cards, self.bb_shuffle, deck=deck)
+        uncreation = iterate_through_cards(self, isBBPair, cards, deck, card_labels, sum_tracker,
+                                           rows=self.grid_rows)
         four_choose_two = VGroup(
-            MathTex(r"\binom{4}{2}").to_edge(RIGHT, buff=2).match_y(second_term_equals_0),
+            MathTex(f"\\binom{{{blacks}}}{{2}}").to_edge(RIGHT, buff=2).match_y(second_term_equals_0),
         )
         # added after the previous line so it could have the same x and y positions
         four_choose_two.add(
-            MathTex(r"\binom{4}{2} = 6").match_x(four_choose_two[0]).match_y(four_choose_two[0])
+            MathTex(f"\\binom{{{blacks}}}{{2}} = {bb_pairs}").match_x(four_choose_two[0]).match_y(four_choose_two[0])
         )
         uncreation.extend([
             second_term_equals_0.animate.set_x(cards.get_right()[0] + 3),
@@ -419,33 +551,46 @@ class CSP(Scene):
         self.wait(1)
         self.play(*uncreation)
         # returns the cards back to the solved state
-        shuffle_cards(self, cards, [3, 6, 1, 5, 7, 2, 0, 4])
+        shuffle_cards(self, cards, self.bb_shuffle.inverse(), deck=deck)
 
         self.play(TransformByGlyphMap(
             four_choose_two[0], four_choose_two[1],
-            *[([i], [i]) for i in range(4)], ([],[4,5])
+            *[([i], [i]) for i in range(4)], ([], list(range(4, len(four_choose_two[1][0]))))
         ))
 
-        equivalence = MathTex(r"\sum_{i=1}^{8} \sum_{j=1}^{i-1}b_i b_j = \binom{4}{2} = 6"
+        equivalence = MathTex(sum_tex + f"b_i b_j = \\binom{{{blacks}}}{{2}} = {bb_pairs}"
                               ).match_x(b_k)
+        # the count's digits go to the digits after the second "="
         self.play(
             TransformByGlyphMap(
                 second_term_equals_0, equivalence,
-                *[([i], [i]) for i in range(16)], ([16],[16,21]), ([17],[22])
+                *[([i], [i]) for i in range(16)], ([16],[16,21]),
+                (list(range(17, len(second_term_equals_0[0]))), list(range(22, len(equivalence[0]))))
             ),
             TransformByGlyphMap(
                 four_choose_two[1], equivalence,
-                *[([i], [i + 17]) for i in range(6)]
+                *[([i], [i + 17]) for i in range(len(four_choose_two[1][0]))]
             )
         )
-        check_mark = SVGMobject("check_mark.svg").scale(0.4).next_to(equivalence, UP, buff=0.1)
+        check_mark = load_svg(Path("check_mark.svg")).scale(0.4).next_to(equivalence, UP, buff=0.1)
         self.play(FadeIn(check_mark))
         self.wait(0.5)
         self.play(FadeOut(check_mark))
 
+        self.og_split_into_separate_sums = og_split_into_separate_sums
+        self.split_into_separate_sums = split_into_separate_sums
+        self.equivalence = equivalence
+
+    def mod_2_reduction(self):
+        og_split_into_separate_sums = self.og_split_into_separate_sums
+        split_into_separate_sums, equivalence = self.split_into_separate_sums, self.equivalence
+        n, blacks = len(self.cards), int(self.deck.colors.sum())
+
         og_split_into_separate_sums.restore().match_x(equivalence).shift(UP)
 
-        first_term_minus_6_tex = r"\sum_{i=1}^{8} \sum_{j=1}^{i-1} b_i-6"
+        first_term_minus_6_tex = f"\\sum_{{i=1}}^{{{n}}} \\sum_{{j=1}}^{{i-1}} b_i-{comb(blacks, 2)}"
+        # the minus sign in front of C(blacks, 2), not the one in i-1
+        minus_index = first_term_minus_6_tex.rindex("-")
         first_term_minus_6 = MathTex(first_term_minus_6_tex
                                      ).align_to(split_into_separate_sums, LEFT)
         
@@ -455,29 +600,32 @@ class CSP(Scene):
             lag_ratio=0.35
         ))
 
+        # glyphs 15 onwards are the digits of C(blacks, 2)
+        n_glyphs = len(first_term_minus_6[0])
         self.play(TransformByGlyphMap(
             og_split_into_separate_sums, first_term_minus_6, 
-            *[([i], [i]) for i in range(15)], *[([i], [15]) for i in range(15, 31)]
+            *[([i], [i]) for i in range(15)], *[([i], list(range(15, n_glyphs))) for i in range(15, 31)]
         ))
 
         mod_2 = MathTex(first_term_minus_6.get_tex_string() + r"\pmod{2}"
                         ).align_to(first_term_minus_6, LEFT)
         self.play(TransformByGlyphMap(
             first_term_minus_6, mod_2,
-            *[([i], [i]) for i in range(16)], *[([], [i]) for i in range(16, 22)]
+            *[([i], [i]) for i in range(n_glyphs)], *[([], [i]) for i in range(n_glyphs, n_glyphs + 6)]
         ))
 
         minus_0 = MathTex(
-            first_term_minus_6_tex[:first_term_minus_6_tex.index("6")] 
+            first_term_minus_6_tex[:minus_index + 1]
             + "0" + mod_2.get_tex_string()[-8:]
         ).align_to(mod_2, LEFT)
         self.play(TransformByGlyphMap(
             mod_2, minus_0,
-            *[([i], [i]) for i in range(21)]
+            *[([i], [i]) for i in range(15)], (list(range(15, n_glyphs)), [15]),
+            *[([i], [i - n_glyphs + 16]) for i in range(n_glyphs, n_glyphs + 5)]
         ))
 
         first_term = MathTex(
-            first_term_minus_6_tex[:first_term_minus_6_tex.index("-6")]
+            first_term_minus_6_tex[:minus_index]
             + mod_2.get_tex_string()[-8:]
         ).align_to(minus_0, LEFT)
         self.play(TransformByGlyphMap(
@@ -495,8 +643,14 @@ class CSP(Scene):
         self.play(ReplacementTransform(first_term, first_term_temp), run_time=0.01)
         first_term = first_term_temp
         
+        self.first_term = first_term
+
+    def even_expansion(self):
+        b_k, i_and_j, first_term = self.b_k, self.i_and_j, self.first_term
+        n = len(self.cards)
+
         expansion_tex = []
-        for i in range(2, 9):
+        for i in range(2, n + 1):
             expansion_tex.append(f"b_{i} +" * (i-1))
         # removes the final plus sign
         expansion_tex[-1] = expansion_tex[-1][:-1]
@@ -515,7 +669,7 @@ class CSP(Scene):
         self.play(AnimationGroup(*boxing[:2], lag_ratio=1.25))
         self.play(AnimationGroup(*boxing[2:], lag_ratio=0.15))
 
-        new_expression = MathTex(r"\sum_{i=1}^{8}", "b_i(i-1)").match_x(b_k)
+        new_expression = MathTex(f"\\sum_{{i=1}}^{{{n}}}", "b_i(i-1)").match_x(b_k)
         self.play(ReplacementTransform(
             VGroup(first_term[0], equals, expansion), new_expression
         ))
@@ -523,7 +677,7 @@ class CSP(Scene):
         remove_sum = MathTex("b_i(i-1)").match_x(new_expression)
         self.play(TransformMatchingTex(new_expression, remove_sum))
 
-        i_odd = MathTex(r"\underline{i\text{: } 1, 3, 5, 7 }"
+        i_odd = MathTex(r"\underline{i\text{: } " + ", ".join(map(str, range(1, n + 1, 2))) + " }"
                         ).next_to(remove_sum, UP, buff=1).scale(0.75)
         self.play(Write(i_odd))
 
@@ -556,7 +710,7 @@ class CSP(Scene):
         self.play(Write(i_even_label))
         self.play(Unwrite(i_even_label), TransformMatchingTex(new_expression, remove_sum))
 
-        i_even = MathTex(r"\underline{i\text{: } 2, 4, 6, 8 }"
+        i_even = MathTex(r"\underline{i\text{: } " + ", ".join(map(str, range(2, n + 1, 2))) + " }"
                         ).move_to(i_odd).scale(0.75)
         self.play(Write(i_even))
         
@@ -595,13 +749,15 @@ class CSP(Scene):
             new_expression[0].get_tex_string(),
             remove_times_1[0].get_tex_string()
         ).match_x(new_expression)
-        i_even_label.restore().add_updater(
-            lambda mob: mob.next_to(final_expression[0][1], DOWN, buff=0.6)
+        add_lazy_updater(
+            i_even_label.restore(),
+            lambda mob: mob.next_to(final_expression[0][1], DOWN, buff=0.6),
+            final_expression[0][1]
         )
         self.play(TransformMatchingTex(remove_times_1, final_expression),
                   Write(i_even_label), Unwrite(i_even))
         
-        even_expansion = MathTex("= b_2 + b_4 + b_6 + b_8")
+        even_expansion = MathTex("= " + " + ".join(f"b_{i}" for i in range(2, n + 1, 2)))
         self.play(
             Write(even_expansion),
             VGroup(final_expression, even_expansion
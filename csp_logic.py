@@ -0,0 +1,127 @@
+import sys
+from itertools import combinations
+from math import comb
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+from card_deck import BLACK, CardDeck
+from deck_stats import exact_distributions
+from permutation import Permutation
+
+# the shuffles CSP plays, in the convention of shuffle_cards: the card at position i moves to
+# position mappings[i]. each one is followed by the shuffle that puts the deck back in order
+BR_SHUFFLE = Permutation([4, 6, 5, 1, 3, 0, 7, 2])
+BR_UNSHUFFLE = BR_SHUFFLE.inverse()
+BB_SHUFFLE = Permutation([6, 2, 5, 0, 7, 3, 1, 4])
+BB_UNSHUFFLE = BB_SHUFFLE.inverse()
+
+
+def solved_deck() -> CardDeck:
+    return CardDeck.from_paths(sorted(Path(__file__).parent.joinpath("SVG Cards").glob("*.svg")))
+
+# the rows iterate_through_cards plays, in order: (i, hits) where hits[j - 1] is whether
+# expression(deck, i, j) holds. the first row, i = 2, is the fence post
+def sweep_rows(deck: CardDeck, expression: Callable[[CardDeck, int, int], bool]) -> Iterator[tuple]:
+    for i in range(2, len(deck) + 1):
+        yield i, [bool(expression(deck, i, j)) for j in range(1, i)]
+
+# what sum_tracker shows after each pair of a row that starts at start
+def running_counts(hits: Sequence[bool], start: int = 0) -> np.ndarray:
+    return start + np.cumsum(hits, dtype=np.int64)
+
+# what sum_tracker ends up at after iterate_through_cards
+def sweep(deck: CardDeck, expression: Callable[[CardDeck, int, int], bool]) -> int:
+    count = 0
+    for _, hits in sweep_rows(deck, expression):
+        count = int(running_counts(hits, count)[-1])
+    return count
+
+# every arrangement of the deck's colors, one at a time
+def arrangements(n: int, blacks: int) -> Iterator[CardDeck]:
+    for positions in combinations(range(n), blacks):
+        colors = np.zeros(n, dtype=np.uint8)
+        colors[list(positions)] = BLACK
+        yield CardDeck(colors)
+
+def check(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+# the position k of the first black card with a red card right behind it: swapping the two
+# makes b_{k+1}(1 - b_k) = 1, the example BR inversion in br_table
+def get_example_swap(deck: CardDeck) -> int:
+    for k in range(1, len(deck)):
+        if deck.b(k) == BLACK and deck.b(k + 1) != BLACK:
+            return k
+    raise ValueError("the deck needs a black card directly followed by a red one for the example inversion")
+
+# the narration of CSP works for any deck and pair of shuffles, but its glyph maps assume the
+# upper limit of the sums is a single digit, and the b_3 and b_5 labels need those positions
+def check_variant(deck: CardDeck, br_shuffle: Permutation, bb_shuffle: Permutation) -> None:
+    n = len(deck)
+    if not 5 <= n <= 9:
+        raise ValueError(f"CSP can only show decks of 5 to 9 cards, got {n}")
+    for name, shuffle in (("br", br_shuffle), ("bb", bb_shuffle)):
+        if len(shuffle) != n:
+            raise ValueError(f"{name} shuffle {shuffle} isn't a shuffle of {n} cards")
+    get_example_swap(deck)
+
+
+# replays the combinatorics of CSP without manim: the shuffles, the counts the sweeps leave
+# on sum_tracker, and the claims the video makes about them
+def run_logic(
+    deck: CardDeck = None, br_shuffle: Permutation = BR_SHUFFLE, bb_shuffle: Permutation = BB_SHUFFLE
+) -> dict:
+    deck = deck or solved_deck()
+    n = len(deck)
+    blacks = int(deck.colors.sum())
+    order = np.arange(n)
+    results = {}
+
+    # sum_{i} sum_{j<i} b_i = sum_i b_i (i - 1), the step in even_expansion
+    positions = np.arange(1, n + 1)
+    check(
+        sweep(deck, lambda deck, i, j: deck.b(i) == 1) == int(deck.colors @ (positions - 1)),
+        "sum over j < i of b_i doesn't match sum of b_i (i - 1)"
+    )
+
+    for name, shuffle, unshuffle, expression, total in (
+        ("br", br_shuffle, br_shuffle.inverse(), CardDeck.is_br_inversion, deck.br_inversions),
+        ("bb", bb_shuffle, bb_shuffle.inverse(), CardDeck.is_bb_pair, deck.bb_pairs),
+    ):
+        check(len(shuffle) == n, f"{name} shuffle {shuffle} isn't a shuffle of {n} cards")
+        deck.shuffle(shuffle)
+        order = shuffle.apply(order)
+
+        count = sweep(deck, expression)
+        check(count == total(), f"{name} sweep counted {count}, the deck model says {total()}")
+        results[name] = count
+        results[f"{name}_even_sum"] = int(deck.colors[1::2].sum())
+
+        deck.shuffle(unshuffle)
+        order = unshuffle.apply(order)
+        check(np.array_equal(order, np.arange(n)), f"{name} unshuffle {unshuffle} doesn't put the deck back in order")
+
+    exact = exact_distributions(n - blacks, blacks)["br"]
+    brute_force = np.bincount([arrangement.br_inversions() for arrangement in arrangements(n, blacks)], minlength=len(exact))
+    check(np.array_equal(exact, brute_force), "exact BR inversion distribution doesn't match brute force")
+    check(exact[results["br"]] > 0, f"{results['br']} BR inversions isn't possible with {blacks} black cards")
+
+    # sum b_i(1 - b_j) = sum b_i (i - 1) - sum b_i b_j, and sum b_i b_j is C(blacks, 2)
+    check(results["bb"] == comb(blacks, 2), f"BB pair count {results['bb']} isn't C({blacks}, 2)")
+    check(
+        (results["br"] - results["br_even_sum"] + comb(blacks, 2)) % 2 == 0,
+        f"BR inversion count {results['br']} doesn't have the parity of "
+        f"b_2 + b_4 + ... = {results['br_even_sum']} minus C({blacks}, 2)"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    try:
+        print(run_logic())
+    except AssertionError as error:
+        print(f"CSP logic check failed: {error}")
+        sys.exit(1)
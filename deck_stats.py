@@ -0,0 +1,146 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from card_deck import BLACK
+
+# statistics of random shuffles of a deck with a given number of black cards, sampled a whole
+# batch of decks at a time or counted exactly. decks are rows of a (decks, n) uint8 array,
+# like CardDeck.colors
+STATISTICS = ("br", "bb", "even_sum")
+# a histogram over more values than this counts them in bins of equal width instead, BR alone
+# can reach n^2 / 4
+MAX_BINS = 1 << 16
+# cells of a chunk of decks, chunks default to as many decks as fit in this
+CHUNK_CELLS = 1 << 22
+
+
+def random_decks(rng: np.random.Generator, n_decks: int, n: int, blacks: int) -> np.ndarray:
+    decks = np.zeros((n_decks, n), dtype=np.uint8)
+    decks[:, :blacks] = BLACK
+    return rng.permuted(decks, axis=1, out=decks)
+
+def deck_statistics(decks: np.ndarray) -> dict:
+    # same sums as CardDeck.br_inversions and bb_pairs, one row per deck
+    # int64, the BR and BB sums pass 2^31 from about 92k cards on
+    b = decks.astype(np.int64)
+    reds_before = np.cumsum(1 - b, axis=1) - (1 - b)
+    blacks_before = np.cumsum(b, axis=1) - b
+    return {
+        "br": np.einsum("ij,ij->i", b, reds_before),
+        "bb": np.einsum("ij,ij->i", b, blacks_before),
+        # b_2 + b_4 + ..., positions are 1-indexed in the video
+        "even_sum": b[:, 1::2].sum(axis=1),
+    }
+
+# the statistics of n_decks shuffles, a chunk at a time so memory stays at chunk_size decks
+def simulate_chunks(n: int, blacks: int, n_decks: int, chunk_size: int = None,
+                    seed: np.random.SeedSequence = None) -> Iterator[dict]:
+    rng = np.random.default_rng(seed)
+    chunk_size = chunk_size or max(1, CHUNK_CELLS // max(n, 1))
+    for start in range(0, n_decks, chunk_size):
+        yield deck_statistics(random_decks(rng, min(chunk_size, n_decks - start), n, blacks))
+
+def max_values(n: int, blacks: int) -> dict:
+    return {"br": blacks * (n - blacks), "bb": comb(blacks, 2), "even_sum": min(blacks, n // 2)}
+
+# how many consecutive values share a bin of each histogram, 1 while every value gets its own
+def bin_widths(n: int, blacks: int) -> dict:
+    return {name: -(-(top + 1) // MAX_BINS) for name, top in max_values(n, blacks).items()}
+
+def empty_histograms(n: int, blacks: int) -> dict:
+    histograms = {
+        name: np.zeros(top // width + 1, dtype=np.int64)
+        for (name, top), width in zip(max_values(n, blacks).items(), bin_widths(n, blacks).values())
+    }
+    # how often the parity claim of the video holds, index 1 when it does
+    histograms["parity_holds"] = np.zeros(2, dtype=np.int64)
+    return histograms
+
+def _simulate_histograms(n: int, blacks: int, n_decks: int, chunk_size: int,
+                         seed: np.random.SeedSequence) -> dict:
+    histograms = empty_histograms(n, blacks)
+    widths = bin_widths(n, blacks)
+    for chunk in simulate_chunks(n, blacks, n_decks, chunk_size, seed):
+        for name in STATISTICS:
+            histograms[name] += np.bincount(chunk[name] // widths[name], minlength=len(histograms[name]))
+        holds = (chunk["br"] - chunk["even_sum"] + chunk["bb"]) % 2 == 0
+        histograms["parity_holds"] += np.bincount(holds, minlength=2)
+    return histograms
+
+def simulate(n: int, blacks: int = None, n_decks: int = 1_000_000, chunk_size: int = None,
+             workers: int = 1, seed: int = None) -> dict:
+    blacks = n // 2 if blacks is None else blacks
+    if not 0 <= blacks <= n:
+        raise ValueError(f"a deck of {n} cards can't have {blacks} black cards")
+    # independent streams per worker, so the result only depends on the seed and worker count
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = [n_decks // workers + (k < n_decks % workers) for k in range(workers)]
+    if workers == 1:
+        return _simulate_histograms(n, blacks, n_decks, chunk_size, seeds[0])
+
+    histograms = empty_histograms(n, blacks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_simulate_histograms, [n] * workers, [blacks] * workers, shares,
+                               [chunk_size] * workers, seeds):
+            for name in histograms:
+                histograms[name] += result[name]
+    return histograms
+
+# exact counts over all C(n, blacks) arrangements, built card by card rather than by enumerating
+# them: a black card placed after r red cards adds r BR inversions (the q-binomial recurrence),
+# and one placed at an even position adds 1 to b_2 + b_4 + .... the state is how many black
+# cards are down so far, holding a table of arrangements by (even_sum, br)
+def exact_distributions(reds: int, blacks: int) -> dict:
+    if reds < 0 or blacks < 0:
+        raise ValueError(f"can't have a deck of {reds} red and {blacks} black cards")
+    n = reds + blacks
+    top = max_values(n, blacks)
+    start = np.zeros((top["even_sum"] + 1, top["br"] + 1), dtype=np.int64)
+    start[0, 0] = 1
+    layer = {0: start}
+    for k in range(n):
+        even = (k + 1) % 2 == 0
+        next_layer = {}
+        for blacks_down, table in layer.items():
+            reds_down = k - blacks_down
+            if reds_down < reds:
+                next_layer[blacks_down] = next_layer.get(blacks_down, 0) + table
+            if blacks_down < blacks:
+                shifted = np.zeros_like(table)
+                shifted[even:, reds_down:] = table[:len(table) - even, :table.shape[1] - reds_down]
+                next_layer[blacks_down + 1] = next_layer.get(blacks_down + 1, 0) + shifted
+        layer = next_layer
+
+    joint = layer[blacks]
+    # every arrangement has the same C(blacks, 2) BB pairs
+    bb = np.zeros(top["bb"] + 1, dtype=np.int64)
+    bb[top["bb"]] = comb(n, blacks)
+    return {"br": joint.sum(axis=0), "bb": bb, "even_sum": joint.sum(axis=1), "even_sum_br": joint}
+
+# rows of (value, count) for create_table, leaving out the values that never came up. a binned
+# histogram gives the lowest value of each bin
+def histogram_table(histogram: Sequence[int], top: int = None, bin_width: int = 1) -> list:
+    rows = [[value * bin_width, int(count)] for value, count in enumerate(histogram) if count]
+    if top is not None:
+        rows = sorted(rows, key=lambda row: -row[1])[:top]
+        rows.sort()
+    return rows
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 52
+    n_decks = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    histograms = simulate(n, n_decks=n_decks, workers=os.cpu_count() or 1, seed=0)
+    widths = bin_widths(n, n // 2)
+    for name in STATISTICS:
+        # the middle of each bin, exact while the bins are single values
+        values = np.arange(len(histograms[name])) * widths[name] + (widths[name] - 1) / 2
+        mean = values @ histograms[name] / n_decks
+        table = histogram_table(histograms[name], top=5, bin_width=widths[name])
+        print(f"{name}: mean {mean:.3f}, most common {table}")
+    print(f"parity claim held for {histograms['parity_holds'][1]} of {n_decks} shuffles")
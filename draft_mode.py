@@ -0,0 +1,57 @@
+from manim import *
+import os
+
+from manim.animation.animation import prepare_animation
+
+import transform_by_glyph_map
+
+
+class DraftMixin:
+    # mixin for a Scene: with draft=True or CSP_DRAFT set (to the time factor, or to anything else
+    # for the default one) every play and wait is time_factor times as long, but never shorter than
+    # min_run_time unless it already was. renders at low quality and leaves out the pause in
+    # TransformByGlyphMap's show_indices detours. every call still happens, in the same order
+    default_time_factor = 0.2
+    min_run_time = 0.1
+    draft_quality = "low_quality"
+
+    def __init__(self, *args, draft: bool = None, time_factor: float = None, **kwargs):
+        setting = os.environ.get("CSP_DRAFT")
+        self.draft = bool(setting) if draft is None else draft
+        if time_factor is None:
+            try:
+                time_factor = float(setting)
+            except (TypeError, ValueError):
+                time_factor = None
+        self.time_factor = time_factor if time_factor is not None and 0 < time_factor < 1 else self.default_time_factor
+        # the camera and the file writer read the quality when the scene is created
+        if self.draft:
+            config.quality = self.draft_quality
+        super().__init__(*args, **kwargs)
+
+    def get_draft_run_time(self, run_time: float) -> float:
+        return max(run_time * self.time_factor, min(run_time, self.min_run_time))
+
+    def skip_detours(self, animation: Animation) -> Animation:
+        # looked up on the module, so it's still the same class after the render daemon reloads it
+        if isinstance(animation, transform_by_glyph_map.TransformByGlyphMap) and animation.show_indices:
+            animation.animations = [anim for anim in animation.animations if not isinstance(anim, Wait)]
+            animation.init_run_time(None)
+        return animation
+
+    def shorten(self, animation: Animation) -> Animation:
+        animation.run_time = self.get_draft_run_time(animation.run_time)
+        # a static wait is rendered from its duration rather than its run_time
+        if isinstance(animation, Wait):
+            animation.duration = animation.run_time
+        return animation
+
+    def play(self, *args, **kwargs):
+        if not self.draft:
+            return super().play(*args, **kwargs)
+        animations = [self.skip_detours(prepare_animation(arg)) for arg in args]
+        if "run_time" in kwargs:
+            kwargs["run_time"] = self.get_draft_run_time(kwargs["run_time"])
+        else:
+            animations = [self.shorten(animation) for animation in animations]
+        return super().play(*animations, **kwargs)
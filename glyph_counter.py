@@ -0,0 +1,72 @@
+from manim import *
+
+from lazy_updaters import add_lazy_updater
+
+
+class GlyphCounter(VGroup):
+    # drop-in for always_redraw(lambda: MathTex(prefix_tex + str(int(tracker.get_value())))):
+    # the prefix is compiled once, the digits are copied from a precompiled "0123456789"
+    # and only the digit glyphs get swapped out when the tracker's value changes
+    _digit_templates = {}
+
+    def __init__(self, prefix_tex: str, tracker: ValueTracker, **kwargs):
+        # the reference "... 0" gives the layout LaTeX would use for the first digit
+        reference = MathTex(prefix_tex + "0", **kwargs)
+        super().__init__(*reference.submobjects)
+        self.tracker = tracker
+        self.tex_kwargs = kwargs
+
+        glyphs = self[0]
+        self.n_prefix = len(glyphs) - 1
+        self.digits = [glyphs[-1]]
+        self.value = 0
+        self.prefix_height = glyphs[0].height
+        self.zero_offset = glyphs[-1].get_center() - glyphs[self.n_prefix - 1].get_center()
+
+        self.show_value(int(tracker.get_value()))
+        # only looks at the tracker on frames where its value moved
+        add_lazy_updater(self, GlyphCounter.sync_with_tracker, tracker)
+
+    @classmethod
+    def get_digit_templates(cls, **kwargs) -> tuple:
+        key = repr(sorted(kwargs.items()))
+        if key not in cls._digit_templates:
+            digits = MathTex("0123456789", **kwargs)[0]
+            zeros = MathTex("00", **kwargs)[0]
+            advance = zeros[1].get_center() - zeros[0].get_center()
+            # where each digit sits inside its slot, relative to where a "0" would sit
+            offsets = [digits[d].get_center() - digits[0].get_center() - d * advance for d in range(10)]
+            cls._digit_templates[key] = (digits, offsets, advance)
+        return cls._digit_templates[key]
+
+    def sync_with_tracker(self) -> None:
+        value = int(self.tracker.get_value())
+        if value != self.value:
+            self.show_value(value)
+
+    def show_value(self, value: int) -> "GlyphCounter":
+        if value < 0:
+            raise ValueError(f"GlyphCounter can only show non-negative values, got {value}")
+        if value == self.value:
+            return self
+        templates, offsets, advance = self.get_digit_templates(**self.tex_kwargs)
+
+        glyphs = self[0]
+        old_x = self.get_x()
+        scale = glyphs[0].height / self.prefix_height
+        origin = glyphs[self.n_prefix - 1].get_center() + scale * self.zero_offset
+
+        new_digits = []
+        for k, char in enumerate(str(value)):
+            d = int(char)
+            digit = templates[d].copy().scale(scale).match_style(self.digits[0])
+            digit.move_to(origin + scale * (k * advance + offsets[d]))
+            new_digits.append(digit)
+
+        glyphs.remove(*self.digits)
+        glyphs.add(*new_digits)
+        self.digits = new_digits
+        self.value = value
+        # always_redraw recentred the whole formula every frame, keep doing that
+        self.set_x(old_x)
+        return self
@@ -0,0 +1,92 @@
+from manim import *
+from typing import Sequence
+
+import numpy as np
+
+from glyph_counter import GlyphCounter
+
+
+class GlyphTable(VGroup):
+    # a table of non-negative integers laid out like IntegerTable with its vertical lines removed.
+    # the cells are copies of the precompiled digits GlyphCounter uses, so a table costs the same
+    # two LaTeX compilations however many cells it has
+    digit_buff = 0.048  # DecimalNumber's digit_buff_per_font_unit at the default font size
+
+    def __init__(
+        self,
+        table: Sequence[Sequence[int]],
+        col_labels: Sequence[VMobject] = None,
+        v_buff: float = 0.8,
+        h_buff: float = 1.3,
+        line_config: dict = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        if len({len(row) for row in table}) > 1:
+            raise ValueError("Not all rows in table have the same length.")
+        self.v_buff = v_buff
+        self.h_buff = h_buff
+        self.col_labels = VGroup(*col_labels) if col_labels is not None else None
+
+        mob_table = [[self.make_integer(value) for value in row] for row in table]
+        if col_labels is not None:
+            mob_table.insert(0, list(col_labels))
+        self.mob_table = mob_table
+        self.rows = VGroup(*[VGroup(*row) for row in mob_table])
+        self.elements = VGroup(*[cell for row in mob_table for cell in row])
+        self.arrange_cells()
+
+        self.add(self.elements)
+        self.center()
+        self.horizontal_lines = self.make_horizontal_lines(**(line_config or {}))
+        self.add(self.horizontal_lines)
+
+    @classmethod
+    def make_integer(cls, value: int) -> VGroup:
+        if value < 0:
+            raise ValueError(f"GlyphTable can only show non-negative values, got {value}")
+        templates = GlyphCounter.get_digit_templates()[0]
+        return VGroup(*[templates[int(char)].copy() for char in str(value)]).arrange(
+            RIGHT, buff=cls.digit_buff, aligned_edge=DOWN
+        )
+
+    # same grid as arrange_in_grid: columns as wide as their widest cell, rows as tall as
+    # their tallest, every cell centered in its slot
+    def arrange_cells(self) -> None:
+        n_rows, n_cols = len(self.mob_table), len(self.mob_table[0])
+        sizes = np.array([[(cell.width, cell.height) for cell in row] for row in self.mob_table]).reshape(n_rows, n_cols, 2)
+        col_widths = sizes[:, :, 0].max(axis=0)
+        row_heights = sizes[:, :, 1].max(axis=1)
+        xs = np.cumsum(col_widths + self.h_buff) - self.h_buff - col_widths / 2
+        ys = -(np.cumsum(row_heights + self.v_buff) - self.v_buff - row_heights / 2)
+        for i, row in enumerate(self.mob_table):
+            for j, cell in enumerate(row):
+                cell.move_to([xs[j], ys[i], 0])
+
+    def make_horizontal_lines(self, **line_config) -> VGroup:
+        left = self.get_left()[0] - 0.5 * self.h_buff
+        right = self.get_right()[0] + 0.5 * self.h_buff
+        bottoms = np.array([row.get_bottom()[1] for row in self.rows[:-1]])
+        tops = np.array([row.get_top()[1] for row in self.rows[1:]])
+        return VGroup(*[Line([left, y, 0], [right, y, 0], **line_config) for y in (bottoms + tops) / 2])
+
+    def get_rows(self) -> VGroup:
+        return self.rows
+
+    def get_labels(self) -> VGroup:
+        return self.col_labels if self.col_labels is not None else VGroup()
+
+    def get_entries(self) -> VGroup:
+        return self.elements
+
+    def get_horizontal_lines(self) -> VGroup:
+        return self.horizontal_lines
+
+    # highlight rectangles are only built when asked for, around the rows where they are now
+    def get_row_rect(self, i: int, buff: float = 0.15, **kwargs) -> SurroundingRectangle:
+        return SurroundingRectangle(self.rows[i], buff=buff, **kwargs)
+
+    def get_row_rects(self, rows: Sequence[int] = None, **kwargs) -> VGroup:
+        first = 0 if self.col_labels is None else 1
+        rows = range(first, len(self.rows)) if rows is None else rows
+        return VGroup(*[self.get_row_rect(i, **kwargs) for i in rows])
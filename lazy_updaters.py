@@ -0,0 +1,52 @@
+from manim import *
+from typing import Callable
+
+from cached_bounds import get_points_version
+
+
+# what a dependency looks like right now: a tracker's value, or which mobjects make up its
+# family and the versions of their points, so a frame costs an integer per member. points
+# written into in place, like mob.points[:] = ..., need cached_bounds.invalidate_bounds
+def get_dependency_state(dependency: Mobject):
+    if isinstance(dependency, ValueTracker):
+        return dependency.get_value()
+    return [(id(mob), get_points_version(mob)) for mob in dependency.get_family()]
+
+
+class LazyUpdater:
+    # an updater that only calls through when one of its dependencies changed since the last
+    # call, otherwise the mobject keeps whatever the last call left it as. a class rather than
+    # a closure so that mobjects using it can still be pickled
+    def __init__(self, updater: Callable[[Mobject], None], *dependencies: Mobject):
+        self.updater = updater
+        self.dependencies = dependencies
+        self.states = None
+
+    def __call__(self, mobject: Mobject) -> None:
+        states = [get_dependency_state(dependency) for dependency in self.dependencies]
+        if states != self.states:
+            self.states = states
+            self.updater(mobject)
+
+    # copies of the mobject keep following the same dependencies, like a closure would
+    def __deepcopy__(self, memo) -> "LazyUpdater":
+        return LazyUpdater(self.updater, *self.dependencies)
+
+    # the states are ids and versions of this process only
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, "states": None}
+
+    # the next call runs the updater whatever the dependencies look like
+    def invalidate(self) -> None:
+        self.states = None
+
+
+def add_lazy_updater(
+    mobject: Mobject,
+    updater: Callable[[Mobject], None],
+    *dependencies: Mobject,
+    call_updater: bool = False
+) -> LazyUpdater:
+    lazy_updater = LazyUpdater(updater, *dependencies)
+    mobject.add_updater(lazy_updater, call_updater=call_updater)
+    return lazy_updater
@@ -0,0 +1,96 @@
+import numpy as np
+from typing import Iterator, Sequence
+
+
+class Permutation:
+    # the item at position i moves to position mapping[i], same convention as shuffle_cards
+    def __init__(self, mapping: Sequence[int]):
+        self.mapping = np.array(mapping, dtype=np.intp)
+        n = len(self.mapping)
+        if self.mapping.ndim != 1 or np.any(self.mapping < 0) or np.any(self.mapping >= n) \
+                or np.any(np.bincount(self.mapping, minlength=n) != 1):
+            raise ValueError(f"{list(mapping)} isn't a permutation of {n} positions")
+        self.mapping.flags.writeable = False
+
+    @classmethod
+    def identity(cls, n: int) -> "Permutation":
+        return cls(np.arange(n))
+
+    # the single permutation that does all of the given ones, first to last
+    @classmethod
+    def compose(cls, *permutations: "Permutation") -> "Permutation":
+        if not permutations:
+            raise ValueError("need at least one permutation to compose")
+        result = cls(permutations[0])
+        for permutation in permutations[1:]:
+            result = result.then(permutation)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def __getitem__(self, i: int) -> int:
+        return int(self.mapping[i])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.mapping.tolist())
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.mapping if dtype is None else self.mapping.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Permutation) and np.array_equal(self.mapping, other.mapping)
+
+    def __hash__(self) -> int:
+        return hash(self.mapping.tobytes())
+
+    def __repr__(self) -> str:
+        return f"Permutation({self.mapping.tolist()})"
+
+    # this permutation followed by other
+    def then(self, other: "Permutation") -> "Permutation":
+        other = other if isinstance(other, Permutation) else Permutation(other)
+        if len(other) != len(self):
+            raise ValueError(f"can't compose permutations of {len(self)} and {len(other)} positions")
+        return Permutation(other.mapping[self.mapping])
+
+    def inverse(self) -> "Permutation":
+        inverse = np.empty_like(self.mapping)
+        inverse[self.mapping] = np.arange(len(self.mapping))
+        return Permutation(inverse)
+
+    def is_identity(self) -> bool:
+        return bool(np.all(self.mapping == np.arange(len(self.mapping))))
+
+    # the positions that don't stay where they are
+    def moved(self) -> np.ndarray:
+        return np.flatnonzero(self.mapping != np.arange(len(self.mapping)))
+
+    def cycles(self, include_fixed: bool = False) -> list:
+        seen = np.zeros(len(self.mapping), dtype=bool)
+        cycles = []
+        for start in range(len(self.mapping)):
+            if seen[start]:
+                continue
+            cycle = []
+            i = start
+            while not seen[i]:
+                seen[i] = True
+                cycle.append(i)
+                i = int(self.mapping[i])
+            if include_fixed or len(cycle) > 1:
+                cycles.append(tuple(cycle))
+        return cycles
+
+    # the items of a sequence in their new order, a list stays a list
+    def apply(self, items: Sequence) -> Sequence:
+        if len(items) != len(self.mapping):
+            raise ValueError(f"can't shuffle {len(items)} items with a permutation of {len(self.mapping)}")
+        if isinstance(items, np.ndarray):
+            shuffled = np.empty_like(items)
+            shuffled[self.mapping] = items
+            return shuffled
+        shuffled = [None] * len(items)
+        for item, new_index in zip(items, self.mapping.tolist()):
+            shuffled[new_index] = item
+        return shuffled
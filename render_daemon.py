@@ -0,0 +1,142 @@
+from manim import *
+import argparse
+import ast
+import importlib
+import logging
+import re
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Sequence
+
+from render_sections import get_scene_class, prepare_snapshots, render_section
+
+logger = logging.getLogger(__name__)
+
+
+# the source of every top-level definition in a module, with the methods of classes
+# listed separately as "Class.method" and the class itself as what's left around them
+def get_top_level_sources(module: ModuleType) -> dict:
+    text = Path(module.__file__).read_text()
+    sources = {}
+    for node in ast.parse(text).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            sources[node.name] = ast.get_source_segment(text, node)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    sources[target.id] = ast.get_source_segment(text, node)
+        elif isinstance(node, ast.ClassDef):
+            rest = ast.get_source_segment(text, node)
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    method = ast.get_source_segment(text, item)
+                    sources[f"{node.name}.{item.name}"] = method
+                    rest = rest.replace(method, "")
+            sources[node.name] = rest
+    return sources
+
+def get_changed_names(old: dict, new: dict) -> set:
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+def get_mention_pattern(names: set) -> re.Pattern:
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(names))) + r")\b")
+
+# the changed top-level names and every top-level name whose source mentions one of them,
+# directly or through other names that do. a class counts as one name with all of its methods
+def get_dependents(sources: dict, changed: set, exclude: str = None) -> set:
+    texts = {}
+    for name, source in sources.items():
+        top_level = name.split(".")[0]
+        if top_level != exclude:
+            texts[top_level] = texts.get(top_level, "") + source
+    affected = {name.split(".")[0] for name in changed}
+    while True:
+        pattern = get_mention_pattern(affected)
+        found = {name for name, text in texts.items() if name not in affected and pattern.search(text)}
+        if not found:
+            return affected
+        affected |= found
+
+# sections whose own source changed, or that use something that changed. any other change to
+# the scene class (setup, a helper method, a class attribute) can reach every section
+def get_affected_sections(scene_class: type, sources: dict, changed: set) -> list:
+    class_name = scene_class.__name__
+    section_names = {f"{class_name}.{section}" for section in scene_class.sections}
+    if any(name == class_name or (name.startswith(f"{class_name}.") and name not in section_names) for name in changed):
+        return list(scene_class.sections)
+    others = {name for name in changed if name.split(".")[0] != class_name}
+    pattern = get_mention_pattern(get_dependents(sources, others, exclude=class_name)) if others else None
+    return [
+        section for section in scene_class.sections
+        if f"{class_name}.{section}" in changed
+        or (pattern is not None and pattern.search(sources[f"{class_name}.{section}"]))
+    ]
+
+def get_mtimes(modules: Sequence[ModuleType]) -> list:
+    return [Path(module.__file__).stat().st_mtime_ns for module in modules]
+
+
+# keeps manim, the svg and glyph caches and the watched modules loaded, and re-renders the
+# sections an edit touches as soon as one of the watched files is saved. snapshots are keyed
+# on the sections up to their own, so after an edit to a section the one before it still has
+# a good snapshot to start from and a preview clip only costs its own section. an edit to
+# code every section uses replays the sections before the first one it touches
+def serve(
+    scene: str = "csp:CSP",
+    watched: Sequence[str] = ("transform_by_glyph_map", "csp"),
+    overrides: dict = None,
+    interval: float = 0.25
+) -> None:
+    overrides = overrides or {}
+    # reloaded in this order, so later modules pick up the new classes of earlier ones
+    modules = [importlib.import_module(name) for name in watched]
+    prepare_snapshots(scene, overrides)
+    sources = {module.__name__: get_top_level_sources(module) for module in modules}
+    mtimes = get_mtimes(modules)
+    logger.info("watching %s", ", ".join(module.__file__ for module in modules))
+
+    while True:
+        time.sleep(interval)
+        new_mtimes = get_mtimes(modules)
+        if new_mtimes == mtimes:
+            continue
+        mtimes = new_mtimes
+        try:
+            for module in modules:
+                importlib.reload(module)
+            new_sources = {module.__name__: get_top_level_sources(module) for module in modules}
+        except Exception:
+            # most likely saved halfway through an edit, wait for the next save
+            logger.exception("couldn't reload the watched modules")
+            continue
+
+        changed = set()
+        for name in new_sources:
+            changed |= get_changed_names(sources.get(name, {}), new_sources[name])
+        scene_class = get_scene_class(scene)
+        # names are looked up across all the watched modules, csp uses what the others define
+        merged = {name: source for module_sources in new_sources.values() for name, source in module_sources.items()}
+        sections = get_affected_sections(scene_class, merged, changed)
+        sources = new_sources
+        logger.info("changed: %s, re-rendering: %s", sorted(changed), sections)
+
+        for section in sections:
+            start = time.perf_counter()
+            try:
+                movie = render_section(scene, section, overrides)
+            except Exception:
+                logger.exception("section %s failed", section)
+                break
+            logger.info("preview of %s ready in %.1fs: %s", section, time.perf_counter() - start, movie)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="re-renders the sections of a SectionedScene as their code changes")
+    parser.add_argument("scene", nargs="?", default="csp:CSP", help="module:class of the scene")
+    parser.add_argument("-w", "--watch", nargs="+", default=["transform_by_glyph_map", "csp"],
+                        help="modules to watch, in the order they should be reloaded")
+    parser.add_argument("-q", "--quality", default="low_quality", help="manim quality of the previews")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve(args.scene, args.watch, {"quality": args.quality})
@@ -0,0 +1,72 @@
+from manim import *
+import argparse
+import importlib
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+from static_frames import get_ffmpeg_executable
+
+
+# a "module:Class" string, or a scene class that's already at hand
+def get_scene_class(scene) -> type:
+    if isinstance(scene, type):
+        return scene
+    module_name, class_name = scene.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+# runs every section without rendering, which leaves a snapshot of each section's end state
+# behind for the workers to start from
+def prepare_snapshots(scene: str, overrides: dict) -> None:
+    with tempconfig({**overrides, "dry_run": True}):
+        get_scene_class(scene)(skip_animations=True).render()
+
+def render_section(scene: str, name: str, overrides: dict) -> Path:
+    # each worker gets its own video dir, so the partial movie files of different sections
+    # (or of the same section of different scenes) never end up in the same folder
+    scene_class = get_scene_class(scene)
+    video_dir = Path(overrides.get("media_dir", config.media_dir)) / "sections" / scene_class.__name__ / name
+    with tempconfig({**overrides, "video_dir": str(video_dir), "output_file": name}):
+        scene_object = scene_class(start_section=name, end_section=name)
+        scene_object.render()
+        return Path(scene_object.renderer.file_writer.movie_file_path)
+
+def concat_movies(movies: Sequence[Path], output: Path) -> Path:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".txt")
+    file_list.write_text("".join(f"file '{movie.resolve().as_posix()}'\n" for movie in movies))
+    # every section comes out of the same encoder settings, so the streams are copied as they are
+    subprocess.run(
+        [
+            get_ffmpeg_executable(), "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(file_list),
+            "-c", "copy", str(output),
+        ],
+        check=True,
+    )
+    file_list.unlink()
+    return output
+
+def render_in_parallel(scene: str, output: Path, workers: int = None, overrides: dict = None) -> Path:
+    overrides = overrides or {}
+    prepare_snapshots(scene, overrides)
+    sections = get_scene_class(scene).sections
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # map hands the results back in section order, whatever order they finish in
+        movies = list(pool.map(render_section, [scene] * len(sections), sections, [overrides] * len(sections)))
+    return concat_movies(movies, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="renders the sections of a SectionedScene in parallel")
+    parser.add_argument("scene", nargs="?", default="csp:CSP", help="module:class of the scene")
+    parser.add_argument("-o", "--output", type=Path, default=None)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("-q", "--quality", default=None, help="manim quality, e.g. low_quality")
+    args = parser.parse_args()
+
+    overrides = {"quality": args.quality} if args.quality else {}
+    output = args.output or Path(config.media_dir) / "videos" / f"{args.scene.split(':')[1]}.mp4"
+    print(render_in_parallel(args.scene, output, args.workers, overrides))
@@ -0,0 +1,123 @@
+from manim import *
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+from card_deck import CardDeck
+from csp import CSP
+from csp_logic import run_logic
+from permutation import Permutation
+from render_sections import concat_movies, prepare_snapshots, render_section
+
+logger = logging.getLogger(__name__)
+
+
+# a subclass of CSP with the deck, shuffles and grid of one entry of the config, e.g.
+# {"name": "CSP_3_blacks", "cards": ["B1.svg", ...], "br_shuffle": [...], "bb_shuffle": [...], "rows": 2}
+# where anything left out stays what CSP uses. the variants share CSP's tex manifest, so every
+# variant gets the strings the others already compiled precompiled in one go
+def make_variant(spec: dict) -> type:
+    parameters = {"tex_manifest": CSP.__name__}
+    if "cards" in spec:
+        parameters["card_files"] = tuple(spec["cards"])
+    if "br_shuffle" in spec:
+        parameters["br_shuffle"] = Permutation(spec["br_shuffle"])
+    if "bb_shuffle" in spec:
+        parameters["bb_shuffle"] = Permutation(spec["bb_shuffle"])
+    if "rows" in spec:
+        parameters["grid_rows"] = int(spec["rows"])
+    return type(spec["name"], (CSP,), parameters)
+
+# fails before anything renders: every variant needs a name of its own that can be a class
+# and file name, a deck the narration can show, and has to pass the checks of csp_logic
+def check_variants(specs: Sequence[dict]) -> None:
+    names = [spec.get("name") for spec in specs]
+    for name in names:
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError(f"variant name {name!r} isn't a valid class name")
+        if names.count(name) > 1:
+            raise ValueError(f"more than one variant is called {name!r}")
+    for spec in specs:
+        variant = make_variant(spec)
+        variant.check_parameters()
+        try:
+            run_logic(CardDeck.from_paths(variant.get_card_files()), variant.br_shuffle, variant.bb_shuffle)
+        except AssertionError as error:
+            raise ValueError(f"variant {spec['name']}: {error}") from error
+
+
+# the workers rebuild the variant from its entry, the classes themselves can't be pickled
+def prepare_variant(spec: dict, overrides: dict) -> None:
+    prepare_snapshots(make_variant(spec), overrides)
+
+def render_variant_section(spec: dict, name: str, overrides: dict) -> Path:
+    return render_section(make_variant(spec), name, overrides)
+
+# which (variant, section) pairs actually need rendering: a section whose source hash (its code
+# and that of the sections before it, their helpers, and the parameters they read) matches
+# one already in the list comes out the same, so its movie is reused instead
+def plan_sections(specs: Sequence[dict]) -> tuple:
+    to_render, keys = {}, []
+    for spec in specs:
+        variant = make_variant(spec)
+        variant_keys = [variant.get_source_hash(section) for section in variant.sections]
+        for section, key in zip(variant.sections, variant_keys):
+            to_render.setdefault(key, (spec, section))
+        keys.append(variant_keys)
+    return to_render, keys
+
+
+# renders every variant in the config across a process pool. the workers stay alive between
+# tasks, so each one keeps its parsed svgs and digit templates for the sections that follow,
+# and the svg, tex and partial movie caches on disk are shared by all of them
+def render_variants(config_file: Path, workers: int = None, overrides: dict = None) -> list:
+    settings = json.loads(Path(config_file).read_text())
+    specs = settings["variants"]
+    overrides = {"quality": settings.get("quality", "high_quality"), **(overrides or {})}
+    workers = workers or settings.get("workers") or os.cpu_count()
+    output_dir = Path(settings.get("output_dir", Path(config.media_dir) / "videos" / "variants"))
+
+    check_variants(specs)
+    to_render, keys = plan_sections(specs)
+    # only variants that render a section of their own need snapshots to start it from
+    rendering = {spec["name"] for spec, _ in to_render.values()}
+    logger.info(
+        "%d variants, %d of %d sections to render",
+        len(specs), len(to_render), sum(len(variant_keys) for variant_keys in keys)
+    )
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        prepared = [spec for spec in specs if spec["name"] in rendering]
+        list(pool.map(prepare_variant, prepared, [overrides] * len(prepared)))
+        jobs = list(to_render.values())
+        movies = dict(zip(to_render, pool.map(
+            render_variant_section, *zip(*jobs), [overrides] * len(jobs)
+        )))
+
+    outputs = [
+        concat_movies([movies[key] for key in variant_keys], output_dir / f"{spec['name']}.mp4")
+        for spec, variant_keys in zip(specs, keys)
+    ]
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "rendered %d videos in %.1fs, %.1f videos per hour with %d workers",
+        len(outputs), elapsed, len(outputs) * 3600 / elapsed, workers
+    )
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="renders every variant of CSP listed in a config file")
+    parser.add_argument("config", type=Path, help="json file with the variants to render")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("-q", "--quality", default=None, help="manim quality, overrides the config's")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    for output in render_variants(args.config, args.workers, {"quality": args.quality} if args.quality else {}):
+        print(output)
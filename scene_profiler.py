@@ -0,0 +1,157 @@
+from manim import *
+import csv
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from manim.utils import tex_file_writing
+
+logger = logging.getLogger(__name__)
+
+# work manim does outside of any one scene, counted by the wrappers install_counters() puts in place
+counters = {"tex_compilations": 0, "svg_parses": 0}
+_counters_installed = False
+
+
+def install_counters() -> None:
+    global _counters_installed
+    if _counters_installed:
+        return
+    _counters_installed = True
+
+    compile_tex = tex_file_writing.compile_tex
+    def counting_compile_tex(*args, **kwargs):
+        counters["tex_compilations"] += 1
+        return compile_tex(*args, **kwargs)
+    tex_file_writing.compile_tex = counting_compile_tex
+
+    generate_mobject = SVGMobject.generate_mobject
+    def counting_generate_mobject(self, *args, **kwargs):
+        counters["svg_parses"] += 1
+        return generate_mobject(self, *args, **kwargs)
+    SVGMobject.generate_mobject = counting_generate_mobject
+
+
+class SceneProfiler:
+    # mixin for a Scene: with profile=True or CSP_PROFILE set, every play/wait gets a record of
+    # where it was called from and what it cost, written out as json and csv when the scene ends
+    profile_fields = [
+        "index", "kind", "section", "line", "animations", "wall_time", "code_time", "frames",
+        "frames_rendered", "mobjects", "points", "tex_compilations", "svg_parses", "updater_time",
+    ]
+
+    def __init__(self, *args, profile: bool = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profiling = bool(os.environ.get("CSP_PROFILE")) if profile is None else profile
+        self.profile_records = []
+        self.profile_depth = 0
+        if not self.profiling:
+            return
+
+        install_counters()
+        self.profile_totals = {"frames": 0, "frames_rendered": 0, "updater_time": 0.0}
+        self.profile_last = self.take_profile_sample()
+
+        add_frame = self.renderer.add_frame
+        def counting_add_frame(frame, num_frames=1):
+            if not self.renderer.skip_animations:
+                self.profile_totals["frames"] += num_frames
+                self.profile_totals["frames_rendered"] += 1
+            return add_frame(frame, num_frames)
+        self.renderer.add_frame = counting_add_frame
+
+        update_mobjects = self.update_mobjects
+        def timed_update_mobjects(dt):
+            start = time.perf_counter()
+            update_mobjects(dt)
+            self.profile_totals["updater_time"] += time.perf_counter() - start
+        self.update_mobjects = timed_update_mobjects
+
+    def take_profile_sample(self) -> dict:
+        return {"time": time.perf_counter(), **counters, **self.profile_totals}
+
+    # the line in the scene's own file that led to this call
+    def get_calling_line(self) -> int:
+        scene_file = inspect.getfile(type(self))
+        frame = sys._getframe(1)
+        while frame is not None:
+            if frame.f_code.co_filename == scene_file:
+                return frame.f_lineno
+            frame = frame.f_back
+        return None
+
+    def profile_call(self, kind: str, call, args: tuple, kwargs: dict):
+        # wait() goes through play(), only the outermost call gets a record
+        if not self.profiling or self.profile_depth > 0:
+            return call(*args, **kwargs)
+
+        self.profile_depth += 1
+        start = self.take_profile_sample()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            self.profile_depth -= 1
+            end = self.take_profile_sample()
+            family = self.get_mobject_family_members()
+            self.profile_records.append({
+                "index": len(self.profile_records),
+                "kind": kind,
+                "section": getattr(self, "current_section", None),
+                "line": self.get_calling_line(),
+                "animations": " ".join(type(arg).__name__ for arg in args) if kind == "play" else "",
+                "wall_time": end["time"] - start["time"],
+                # the script's own code since the last call, where most mobjects get built
+                "code_time": start["time"] - self.profile_last["time"],
+                "frames": end["frames"] - start["frames"],
+                "frames_rendered": end["frames_rendered"] - start["frames_rendered"],
+                "mobjects": len(family),
+                "points": sum(len(mob.points) for mob in family),
+                "tex_compilations": end["tex_compilations"] - self.profile_last["tex_compilations"],
+                "svg_parses": end["svg_parses"] - self.profile_last["svg_parses"],
+                "updater_time": end["updater_time"] - start["updater_time"],
+            })
+            self.profile_last = end
+
+    def play(self, *args, **kwargs):
+        return self.profile_call("play", super().play, args, kwargs)
+
+    def wait(self, *args, **kwargs):
+        return self.profile_call("wait", super().wait, args, kwargs)
+
+    def get_profile_summary(self) -> dict:
+        summary = defaultdict(lambda: defaultdict(float))
+        for record in self.profile_records:
+            section = summary[str(record["section"])]
+            section["calls"] += 1
+            for key in ("wall_time", "code_time", "frames", "tex_compilations", "svg_parses", "updater_time"):
+                section[key] += record[key]
+        return {name: dict(values) for name, values in summary.items()}
+
+    def write_profile(self) -> Path:
+        path = Path(os.environ.get("CSP_PROFILE_DIR", Path(config.media_dir) / "profile")) / type(self).__name__
+        path.parent.mkdir(parents=True, exist_ok=True)
+        summary = self.get_profile_summary()
+        path.with_suffix(".json").write_text(json.dumps(
+            {"calls": self.profile_records, "sections": summary}, indent=2
+        ))
+        with path.with_suffix(".csv").open("w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.profile_fields)
+            writer.writeheader()
+            writer.writerows(self.profile_records)
+
+        for name, values in summary.items():
+            logger.info(
+                "%s: %d calls, %.2fs playing, %.2fs in script code, %d tex compilations",
+                name, values["calls"], values["wall_time"], values["code_time"], values["tex_compilations"]
+            )
+        return path
+
+    def tear_down(self):
+        super().tear_down()
+        if self.profiling:
+            self.write_profile()
@@ -0,0 +1,135 @@
+from manim import *
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# nothing of it can show up in a frame: all of its points sit on one spot (what ShrinkToCenter
+# leaves behind) or every member with points is see-through. mobjects without any points are
+# containers that may still get filled, so they never count
+def is_invisible(mobject: Mobject, atol: float = 1e-8) -> bool:
+    members = mobject.family_members_with_points()
+    if not members:
+        return False
+    points = np.concatenate([member.points for member in members])
+    if np.all(np.ptp(points, axis=0) <= atol):
+        return True
+    return all(is_transparent(member) for member in members)
+
+def is_transparent(mobject: Mobject) -> bool:
+    # only vectorized mobjects have opacities to look at, anything else is assumed visible
+    if not isinstance(mobject, VMobject):
+        return False
+    if np.any(mobject.get_fill_opacities() > 0):
+        return False
+    return all(
+        mobject.get_stroke_width(background) == 0 or not np.any(mobject.get_stroke_opacities(background) > 0)
+        for background in (False, True)
+    )
+
+def has_updaters(mobject: Mobject) -> bool:
+    return any(member.updaters for member in mobject.get_family())
+
+# (parent, index, submobject) for the invisible submobjects below mobject, the topmost ones of
+# each branch. nothing below a mobject with updaters of its own is looked at, those often
+# rebuild or reuse their submobjects
+def find_invisible_submobjects(mobject: Mobject) -> list:
+    found = []
+    stack = [mobject]
+    while stack:
+        parent = stack.pop()
+        if parent.updaters:
+            continue
+        for index, submobject in enumerate(parent.submobjects):
+            if is_invisible(submobject):
+                found.append((parent, index, submobject))
+            else:
+                stack.append(submobject)
+    return found
+
+# an empty mobject takes the submobject's place, so that the sections still find the ones
+# after it at the same index, like split_into_separate_sums[1] once [0] has shrunk away
+def prune_submobject(parent: Mobject, index: int) -> None:
+    submobject = parent.submobjects[index]
+    parent.submobjects[index] = VMobject() if isinstance(submobject, VMobject) else Mobject()
+
+
+class ScenePruner:
+    # mixin for a Scene: with prune=True or CSP_PRUNE set, every play/wait is followed by a look
+    # at the scene graph. invisible mobjects are removed, top-level ones from the scene and
+    # submobjects from their parents, unless something in them has updaters that might bring them
+    # back, and the mobject and point totals after every play are summarized per section when the scene ends, with whatever invisible mobjects were
+    # left behind. CSP_PRUNE=report only tracks and reports, the scene is left as it is.
+    # anything removed that gets animated again is added back by the play, like after a FadeOut
+    def __init__(self, *args, prune: bool = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        setting = os.environ.get("CSP_PRUNE")
+        self.tracking = bool(setting) if prune is None else prune
+        self.pruning = self.tracking and (prune is not None or setting != "report")
+        self.scene_graph_records = []
+
+    def get_scene_graph_totals(self) -> tuple:
+        family = self.get_mobject_family_members()
+        return len(family), sum(len(mob.points) for mob in family)
+
+    def check_scene_graph(self) -> None:
+        invisible, submobjects = [], []
+        for mob in self.mobjects:
+            if mob in self.foreground_mobjects:
+                continue
+            if is_invisible(mob):
+                invisible.append(mob)
+            else:
+                submobjects.extend(find_invisible_submobjects(mob))
+        pruned = [mob for mob in invisible if not has_updaters(mob)] if self.pruning else []
+        if pruned:
+            self.remove(*pruned)
+        kept = []
+        for parent, index, submobject in submobjects:
+            if self.pruning and not has_updaters(submobject):
+                prune_submobject(parent, index)
+            else:
+                kept.append(f"{type(submobject).__name__} in {type(parent).__name__}")
+        mobjects, points = self.get_scene_graph_totals()
+        self.scene_graph_records.append({
+            "section": getattr(self, "current_section", None),
+            "mobjects": mobjects,
+            "points": points,
+            "pruned": len(pruned) + len(submobjects) - len(kept),
+            "invisible": [type(mob).__name__ for mob in invisible if mob not in pruned] + kept,
+        })
+
+    def play(self, *args, **kwargs):
+        result = super().play(*args, **kwargs)
+        if self.tracking:
+            self.check_scene_graph()
+        return result
+
+    # net growth of the scene graph over each section, from the section before it, and what
+    # invisible mobjects are still in the scene at its end
+    def report_scene_graph(self) -> None:
+        sections = {}
+        for record in self.scene_graph_records:
+            sections.setdefault(record["section"], []).append(record)
+        previous = {"mobjects": 0, "points": 0}
+        for name, records in sections.items():
+            last = records[-1]
+            message = "%s: %d mobjects (%+d), %d points (%+d), %d pruned"
+            values = [
+                name, last["mobjects"], last["mobjects"] - previous["mobjects"],
+                last["points"], last["points"] - previous["points"],
+                sum(record["pruned"] for record in records),
+            ]
+            if last["invisible"]:
+                logger.warning(message + ", invisible but kept: %s", *values, ", ".join(last["invisible"]))
+            else:
+                logger.info(message, *values)
+            previous = last
+
+    def tear_down(self):
+        super().tear_down()
+        if self.tracking:
+            self.report_scene_graph()
@@ -0,0 +1,149 @@
+from manim import *
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+
+# the module and every module it imports from its own folder, directly or through each other,
+# found from what their globals refer to. sorted by name so the order never depends on imports
+def get_local_modules(module: ModuleType) -> list:
+    folder = Path(module.__file__).resolve().parent
+    found = {module.__name__: module}
+    stack = [module]
+    while stack:
+        for value in list(vars(stack.pop()).values()):
+            if isinstance(value, ModuleType):
+                used = value
+            else:
+                module_name = getattr(value, "__module__", None)
+                used = sys.modules.get(module_name) if isinstance(module_name, str) else None
+            if used is None or used.__name__ in found or not getattr(used, "__file__", None):
+                continue
+            if Path(used.__file__).resolve().parent == folder:
+                found[used.__name__] = used
+                stack.append(used)
+    return [found[name] for name in sorted(found)]
+
+
+class SectionedScene(Scene):
+    # construct() runs the methods named in `sections` in order, each one as its own manim section.
+    # the end state of every section is pickled, so a render can start at any section (the
+    # start_section argument or CSP_START_SECTION) from the snapshot of the section before it,
+    # and stop after any section (end_section or CSP_END_SECTION)
+    sections = []
+    # class attributes a section reads besides its own code, by section name. subclasses that
+    # only change these render different videos from the same sections
+    section_parameters = {}
+
+    def __init__(self, *args, start_section: str = None, end_section: str = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.start_section = start_section or os.environ.get("CSP_START_SECTION")
+        self.end_section = end_section or os.environ.get("CSP_END_SECTION")
+        self.current_section = None
+
+    def get_snapshot_path(self, name: str) -> Path:
+        return Path(config.media_dir) / "section_cache" / f"{type(self).__name__}_{name}.pkl"
+
+    # a snapshot is only good as long as nothing the sections leading up to it run changed: their
+    # own code, everything else in the modules they're written in and the local modules those
+    # import (the helpers that build the state), and the parameters the sections read. the code
+    # of later sections is left out, so editing one keeps the snapshots before it. the same hash
+    # means the same section, whatever the class
+    @classmethod
+    def get_source_hash(cls, name: str) -> str:
+        digest = hashlib.sha256()
+        methods = [getattr(cls, section) for section in cls.sections]
+        modules = {}
+        for method in methods:
+            modules.update((local.__name__, local) for local in get_local_modules(inspect.getmodule(method)))
+        for module_name in sorted(modules):
+            digest.update(module_name.encode())
+            digest.update(cls.get_shared_source(modules[module_name], methods).encode())
+        for section, method in zip(cls.sections[:cls.sections.index(name) + 1], methods):
+            digest.update(inspect.getsource(method).encode())
+            for parameter in cls.section_parameters.get(section, ()):
+                digest.update(f"{parameter}={getattr(cls, parameter)!r}".encode())
+        return digest.hexdigest()
+
+    # a module's source without the section methods written in it
+    @staticmethod
+    def get_shared_source(module: ModuleType, methods: list) -> str:
+        lines = Path(module.__file__).read_text().splitlines()
+        spans = [inspect.getsourcelines(method) for method in methods if inspect.getmodule(method) is module]
+        # from the bottom up, so the line numbers of the ones above still hold
+        for method_lines, first in sorted(spans, key=lambda span: -span[1]):
+            del lines[first - 1:first - 1 + len(method_lines)]
+        return "\n".join(lines)
+
+    def save_snapshot(self, name: str) -> None:
+        snapshot = {
+            "source_hash": self.get_source_hash(name),
+            "background_color": self.camera.background_color,
+            "mobjects": self.mobjects,
+            "foreground_mobjects": self.foreground_mobjects,
+            # everything the sections stored on the scene, pickled together with the mobjects
+            # so that they still refer to the same objects after loading
+            "state": {key: value for key, value in vars(self).items() if key not in self.base_attributes},
+        }
+        path = self.get_snapshot_path(name)
+        try:
+            data = pickle.dumps(snapshot)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            logger.warning("couldn't snapshot section %s: %s", name, error)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # parallel renders load the snapshots other workers write, so swap it in atomically
+        temp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_file.write_bytes(data)
+        temp_file.replace(path)
+
+    def load_snapshot(self, name: str) -> bool:
+        path = self.get_snapshot_path(name)
+        if not path.exists():
+            return False
+        try:
+            snapshot = pickle.loads(path.read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as error:
+            logger.warning("couldn't load the snapshot of section %s: %s", name, error)
+            return False
+        if snapshot["source_hash"] != self.get_source_hash(name):
+            logger.info("snapshot of section %s is out of date", name)
+            return False
+
+        self.clear()
+        self.camera.background_color = snapshot["background_color"]
+        self.add(*snapshot["mobjects"])
+        self.add_foreground_mobjects(*snapshot["foreground_mobjects"])
+        for key, value in snapshot["state"].items():
+            setattr(self, key, value)
+        return True
+
+    def construct(self):
+        for section in (self.start_section, self.end_section):
+            if section is not None and section not in self.sections:
+                raise ValueError(f"unknown section {section!r}, expected one of {self.sections}")
+        self.base_attributes = set(vars(self)) | {"base_attributes"}
+        start = self.sections.index(self.start_section) if self.start_section else 0
+        end = self.sections.index(self.end_section) if self.end_section else len(self.sections) - 1
+        if end < start:
+            raise ValueError(f"section {self.end_section!r} comes before {self.start_section!r}")
+
+        # resumes from the latest usable snapshot, sections between it and the start section
+        # are replayed without rendering to bring their snapshots up to date
+        resume = start
+        while resume > 0 and not self.load_snapshot(self.sections[resume - 1]):
+            resume -= 1
+
+        for index, name in enumerate(self.sections[resume:end + 1], resume):
+            self.current_section = name
+            self.next_section(name, skip_animations=index < start)
+            getattr(self, name)()
+            if index < len(self.sections) - 1:
+                self.save_snapshot(name)
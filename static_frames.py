@@ -0,0 +1,151 @@
+from manim import *
+import logging
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+
+from manim import __version__
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+logger = logging.getLogger(__name__)
+
+# manim up to 0.18 pipes raw frames into an ffmpeg process, from 0.19 on it encodes with PyAV
+PIPE_WRITER = hasattr(SceneFileWriter, "open_movie_pipe")
+PYAV_WRITER = hasattr(SceneFileWriter, "open_partial_movie_stream")
+
+
+# the ffmpeg command line tool, from manim's config where it still has one
+def get_ffmpeg_executable() -> str:
+    executable = getattr(config, "ffmpeg_executable", None) or shutil.which("ffmpeg")
+    if executable is None:
+        raise RuntimeError("the ffmpeg command line tool isn't installed, or isn't on the PATH")
+    return executable
+
+# -fps_mode replaced -vsync in ffmpeg 5.1, builds without a release number are assumed newer
+@lru_cache(maxsize=None)
+def get_passthrough_options() -> tuple:
+    output = subprocess.run([get_ffmpeg_executable(), "-version"], capture_output=True, text=True).stdout
+    match = re.match(r"ffmpeg version n?(\d+)\.(\d+)", output)
+    if match and (int(match[1]), int(match[2])) < (5, 1):
+        return ("-vsync", "passthrough")
+    return ("-fps_mode", "passthrough")
+
+
+class StaticFrameFileWriter(SceneFileWriter):
+    # a wait with nothing to update renders one frame and hands it to the writer for every frame
+    # of the wait. instead of encoding all of them, the partial movie gets that frame twice: at
+    # the start and one frame before the end, so it still lasts the whole wait
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.static_frames = 0
+        self.frames_written = 0
+        self.last_frame = None
+
+    def start_static_frames(self) -> bool:
+        scene = self.renderer.scene
+        if config.renderer != RendererType.CAIRO or not scene.is_current_animation_frozen_frame():
+            self.static_frames = 0
+            return False
+        # the same number of frames freeze_current_frame is about to add
+        dt = 1 / self.renderer.camera.frame_rate
+        self.static_frames = int(scene.duration / dt)
+        self.frames_written = 0
+        return True
+
+    # manim <= 0.18: the wait arrives one write_frame per frame, on a pipe to ffmpeg
+    def open_movie_pipe(self, file_path=None):
+        if not self.start_static_frames():
+            return super().open_movie_pipe(file_path)
+
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        fps = config["frame_rate"]
+        if fps == int(fps):
+            fps = int(fps)
+        command = [
+            get_ffmpeg_executable(),
+            "-y",
+            "-f", "rawvideo",
+            "-s", "%dx%d" % (config["pixel_width"], config["pixel_height"]),
+            "-pix_fmt", "rgba",
+            "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-loglevel", config["ffmpeg_loglevel"].lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+            # the second frame goes where the last frame of the wait would be, and the
+            # timestamps are kept as they are instead of filled back up to a constant rate
+            "-vf", f"setpts=N*{max(self.static_frames - 1, 0)}/({fps}*TB)",
+            *get_passthrough_options(),
+        ]
+        if is_webm_format():
+            command += ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        elif config["transparent"]:
+            command += ["-vcodec", "qtrle"]
+        else:
+            command += ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+        command += [file_path]
+        self.writing_process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write_frame(self, frame_or_renderer, *args, **kwargs):
+        # PyAV writers get the whole wait in one call, encode_and_write_frame handles it
+        if not self.static_frames or PYAV_WRITER:
+            return super().write_frame(frame_or_renderer, *args, **kwargs)
+        self.frames_written += 1
+        self.last_frame = frame_or_renderer
+        if self.frames_written == 1:
+            super().write_frame(frame_or_renderer)
+
+    def close_movie_pipe(self):
+        if self.static_frames and self.frames_written > 1:
+            self.writing_process.stdin.write(self.last_frame.tobytes())
+        self.static_frames = 0
+        self.last_frame = None
+        super().close_movie_pipe()
+
+    # manim >= 0.19: the wait arrives as one frame with num_frames, encoded with PyAV
+    def open_partial_movie_stream(self, file_path=None):
+        self.start_static_frames()
+        super().open_partial_movie_stream(file_path)
+
+    def encode_and_write_frame(self, frame, num_frames: int) -> None:
+        if not self.static_frames:
+            return super().encode_and_write_frame(frame, num_frames)
+        import av
+
+        # the container keeps the timestamps, so the second frame holds the picture to the end
+        for pts in sorted({0, max(num_frames - 1, 0)}):
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            av_frame.pts = pts
+            for packet in self.video_stream.encode(av_frame):
+                self.video_container.mux(packet)
+
+    def close_partial_movie_stream(self):
+        super().close_partial_movie_stream()
+        self.static_frames = 0
+
+
+class StaticFrameRenderer(CairoRenderer):
+    def __init__(self, file_writer_class=StaticFrameFileWriter, **kwargs):
+        super().__init__(file_writer_class=file_writer_class, **kwargs)
+        self.scene = None
+
+    def init_scene(self, scene):
+        self.scene = scene
+        super().init_scene(scene)
+
+
+class StaticFrameScene:
+    # mixin for a Scene that renders with StaticFrameRenderer, unless it's given another renderer.
+    # a manim whose file writer is neither of the two above renders every frame as usual
+    def __init__(self, *args, renderer=None, camera_class=Camera, skip_animations: bool = False, **kwargs):
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            if PIPE_WRITER or PYAV_WRITER:
+                renderer = StaticFrameRenderer(camera_class=camera_class, skip_animations=skip_animations)
+            else:
+                logger.warning("manim %s has a file writer StaticFrameScene doesn't know, static waits "
+                               "are encoded frame by frame", __version__)
+        super().__init__(*args, renderer=renderer, camera_class=camera_class, skip_animations=skip_animations, **kwargs)
@@ -0,0 +1,73 @@
+from manim import *
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+import manim
+
+# parsed svgs by content hash, shared by every card built in this process
+_templates = {}
+
+
+class CachedSVGMobject(VMobject):
+    # the points and style of a parsed SVGMobject, rebuilt without touching the xml
+    def __init__(self, file_name: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.file_name = Path(file_name)
+
+    def get_file_path(self) -> Path:
+        return self.file_name
+
+
+def get_svg_cache_dir() -> Path:
+    return Path(config.media_dir) / "svg_cache"
+
+def svg_cache_key(file_name: Path, **kwargs) -> str:
+    # the file's contents rather than its name or mtime, so edited svgs never hit a stale entry
+    digest = hashlib.sha256(Path(file_name).read_bytes())
+    digest.update(repr(sorted(kwargs.items())).encode())
+    digest.update(manim.__version__.encode())
+    return digest.hexdigest()
+
+def _dump(mob: VMobject) -> dict:
+    return {
+        "points": mob.points,
+        "fill_rgbas": mob.fill_rgbas,
+        "stroke_rgbas": mob.stroke_rgbas,
+        "stroke_width": mob.stroke_width,
+        "background_stroke_rgbas": mob.background_stroke_rgbas,
+        "background_stroke_width": mob.background_stroke_width,
+        "submobjects": [_dump(submob) for submob in mob.submobjects],
+    }
+
+def _load(data: dict, mob: VMobject) -> VMobject:
+    mob.points = data["points"]
+    mob.fill_rgbas = data["fill_rgbas"]
+    mob.stroke_rgbas = data["stroke_rgbas"]
+    mob.stroke_width = data["stroke_width"]
+    mob.background_stroke_rgbas = data["background_stroke_rgbas"]
+    mob.background_stroke_width = data["background_stroke_width"]
+    mob.add(*[_load(submob, VMobject()) for submob in data["submobjects"]])
+    return mob
+
+def load_svg(file_name: Path, **kwargs) -> VMobject:
+    # takes the same arguments as SVGMobject, the svg only gets parsed when neither
+    # this process nor the on-disk cache has seen a file with the same contents
+    if config.renderer != RendererType.CAIRO:
+        return SVGMobject(file_name, **kwargs)
+
+    key = svg_cache_key(file_name, **kwargs)
+    if key not in _templates:
+        cache_file = get_svg_cache_dir() / f"{key}.pkl"
+        if cache_file.exists():
+            data = pickle.loads(cache_file.read_bytes())
+        else:
+            data = _dump(SVGMobject(file_name, **kwargs))
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # renders running in parallel may write the same entry, so swap it in atomically
+            temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            temp_file.write_bytes(pickle.dumps(data))
+            temp_file.replace(cache_file)
+        _templates[key] = _load(data, CachedSVGMobject(file_name))
+    return _templates[key].copy()
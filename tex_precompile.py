@@ -0,0 +1,149 @@
+from manim import *
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+from manim.utils import tex_file_writing
+
+logger = logging.getLogger(__name__)
+
+# (expression, environment) pairs typeset with the default template since recording started
+_recorded = []
+_recording_installed = False
+# the unwrapped version, so that precompiling doesn't record anything itself
+_generate_tex_file = tex_file_writing.generate_tex_file
+
+
+def install_recording() -> None:
+    global _recording_installed
+    if _recording_installed:
+        return
+    _recording_installed = True
+
+    def recording_generate_tex_file(expression, environment=None, tex_template=None):
+        if tex_template is None or tex_template is config["tex_template"]:
+            _recorded.append((expression, environment))
+        return _generate_tex_file(expression, environment, tex_template)
+    tex_file_writing.generate_tex_file = recording_generate_tex_file
+
+
+def get_manifest_path(scene_name: str) -> Path:
+    return Path(config.media_dir) / "tex_manifest" / f"{scene_name}.json"
+
+def load_manifest(scene_name: str) -> list:
+    path = get_manifest_path(scene_name)
+    if not path.exists():
+        return []
+    return [tuple(entry) for entry in json.loads(path.read_text())]
+
+def save_manifest(scene_name: str, entries: Sequence[tuple]) -> None:
+    path = get_manifest_path(scene_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # keeps entries from sections that didn't run this time
+    merged = list(dict.fromkeys([*load_manifest(scene_name), *map(tuple, entries)]))
+    # scenes rendering in parallel may share a manifest, so swap it in atomically
+    temp_file = path.with_suffix(f".{os.getpid()}.tmp")
+    temp_file.write_text(json.dumps(merged, indent=1))
+    temp_file.replace(path)
+
+
+def split_document(code: str) -> tuple:
+    preamble, rest = code.split(r"\begin{document}", 1)
+    return preamble, rest.rsplit(r"\end{document}", 1)[0]
+
+def compile_batch(tex_template: TexTemplate, batch: Sequence[tuple]) -> int:
+    # one page per expression: standalone's multi option turns every manimpage environment
+    # into its own cropped page, the same crop a single-expression document would get
+    tex_dir = config.get_dir("tex_dir")
+    svg_files, pages = [], []
+    for expression, environment in batch:
+        tex_file = _generate_tex_file(expression, environment, tex_template)
+        if environment is not None:
+            code = tex_template.get_texcode_for_expression_in_env(expression, environment)
+        else:
+            code = tex_template.get_texcode_for_expression(expression)
+        preamble, body = split_document(code)
+        svg_files.append(tex_file.with_suffix(".svg"))
+        pages.append(f"\\begin{{manimpage}}{body}\\end{{manimpage}}")
+
+    preamble = re.sub(
+        r"\\documentclass\[(.*?)\]\{standalone\}",
+        lambda match: f"\\documentclass[{match[1]},multi=manimpage]{{standalone}}",
+        preamble, count=1
+    )
+    document = preamble + "\\begin{document}\n" + "\n".join(pages) + "\n\\end{document}\n"
+    digest = hashlib.sha256(document.encode()).hexdigest()[:16]
+    # other processes may be compiling the same batch right now
+    batch_file = tex_dir / f"batch_{digest}_{os.getpid()}.tex"
+    batch_file.write_text(document, encoding="utf-8")
+
+    output_format = tex_template.output_format
+    command = tex_file_writing.tex_compilation_command(tex_template.tex_compiler, output_format, batch_file, tex_dir)
+    log = batch_file.with_suffix(".log")
+    # a page count that doesn't match means some expression didn't make a page of its own,
+    # the pages can't be told apart then and the batch is left for the usual path
+    if os.system(command) != 0 or not log.exists() or f"({len(pages)} page" not in log.read_text(errors="replace"):
+        logger.info("batch %s didn't compile page per expression, skipping it", batch_file.name)
+        return 0
+
+    dvi_file = batch_file.with_suffix(output_format)
+    for page, svg_file in enumerate(svg_files, 1):
+        # manim takes an svg that exists as done, so it only appears once it's written in full
+        temp_file = svg_file.with_suffix(f".{os.getpid()}.svg")
+        os.system(" ".join([
+            "dvisvgm", "--pdf" if output_format == ".pdf" else "", f"-p {page}",
+            f'"{dvi_file.as_posix()}"', "-n", "-v 0", f'-o "{temp_file.as_posix()}"', ">", os.devnull,
+        ]))
+        if temp_file.exists():
+            temp_file.replace(svg_file)
+    for path in (batch_file, log, dvi_file, batch_file.with_suffix(".aux")):
+        path.unlink(missing_ok=True)
+    return sum(svg_file.exists() for svg_file in svg_files)
+
+# compiles every entry that has no svg yet, in batches_per_worker batches per worker
+def precompile(entries: Sequence[tuple], workers: int = None, batches_per_worker: int = 1) -> int:
+    tex_template = config["tex_template"]
+    missing = [
+        (expression, environment) for expression, environment in entries
+        if expression.strip() and not _generate_tex_file(
+            expression, environment, tex_template
+        ).with_suffix(".svg").exists()
+    ]
+    if not missing or r"{standalone}" not in tex_template.body:
+        return 0
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    n_batches = min(workers * batches_per_worker, len(missing))
+    batches = [missing[k::n_batches] for k in range(n_batches)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        compiled = sum(pool.map(lambda batch: compile_batch(tex_template, batch), batches))
+    logger.info("precompiled %d of %d tex strings in %d batches", compiled, len(missing), n_batches)
+    return compiled
+
+
+class TexPrecompiler:
+    # mixin for a Scene: records every string the scene sends to LaTeX in a manifest, and
+    # on later renders compiles the ones missing from the tex cache in a few batches before
+    # construct() starts asking for them one at a time. the strings are only known from a
+    # render that already compiled them, so this pays off when the tex cache is gone but the
+    # manifest isn't (a cleared media/Tex, another machine, a new tex template) and for
+    # variants that share a manifest. the very first render compiles one string at a time as
+    # usual. scenes with the same tex_manifest share one, by default every class has its own
+    tex_manifest = None
+
+    def get_manifest_name(self) -> str:
+        return self.tex_manifest or type(self).__name__
+
+    def setup(self):
+        super().setup()
+        install_recording()
+        precompile(load_manifest(self.get_manifest_name()))
+        self.tex_recording_start = len(_recorded)
+
+    def tear_down(self):
+        save_manifest(self.get_manifest_name(), _recorded[self.tex_recording_start:])
+        super().tear_down()
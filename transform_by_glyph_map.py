@@ -1,11 +1,114 @@
 from manim import *
+import hashlib
+import logging
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
 
 def ir(a,b): # inclusive range, useful for TransformByGlyphMap
     return list(range(a,b+1))
 
+@dataclass
+class GlyphMapReport:
+    # what TransformByGlyphMap would do with a glyph map, worked out without rendering anything
+    n_from: int
+    n_to: int
+    out_of_range_from: list = field(default_factory=list)
+    out_of_range_to: list = field(default_factory=list)
+    # entries that list the same index twice on one side
+    repeated_within_entry: list = field(default_factory=list)
+    # indices that show up in more than one entry: from glyphs get copied, to glyphs get merged
+    duplicated_from: list = field(default_factory=list)
+    duplicated_to: list = field(default_factory=list)
+    # indices no entry mentions, these get paired up in order by TransformByGlyphMap
+    unmapped_from: list = field(default_factory=list)
+    unmapped_to: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.out_of_range_from or self.out_of_range_to or self.repeated_within_entry)
+
+    @property
+    def implicit_pairs(self) -> list:
+        return list(zip(self.unmapped_from, self.unmapped_to))
+
+    def __str__(self) -> str:
+        lines = [f"{self.n_from} glyphs -> {self.n_to} glyphs"]
+        for name in ("out_of_range_from", "out_of_range_to", "repeated_within_entry",
+                     "duplicated_from", "duplicated_to", "unmapped_from", "unmapped_to"):
+            if getattr(self, name):
+                lines.append(f"{name}: {getattr(self, name)}")
+        if len(self.unmapped_from) != len(self.unmapped_to):
+            lines.append(
+                f"{len(self.unmapped_from)} unmapped from glyphs vs {len(self.unmapped_to)} unmapped to glyphs, "
+                "the extras are left alone"
+            )
+        return "\n".join(lines)
+
+
+def validate_glyph_map(mobA, mobB, *glyph_map) -> GlyphMapReport:
+    report = GlyphMapReport(len(mobA[0]), len(mobB[0]))
+    from_counts, to_counts = Counter(), Counter()
+    for from_indices, to_indices in glyph_map:
+        report.out_of_range_from.extend(i for i in from_indices if not 0 <= i < report.n_from)
+        report.out_of_range_to.extend(j for j in to_indices if not 0 <= j < report.n_to)
+        if len(set(from_indices)) != len(from_indices) or len(set(to_indices)) != len(to_indices):
+            report.repeated_within_entry.append((from_indices, to_indices))
+        from_counts.update(set(from_indices))
+        to_counts.update(set(to_indices))
+    report.duplicated_from = sorted(i for i, count in from_counts.items() if count > 1)
+    report.duplicated_to = sorted(j for j, count in to_counts.items() if count > 1)
+    report.unmapped_from = [i for i in range(report.n_from) if i not in from_counts]
+    report.unmapped_to = [j for j in range(report.n_to) if j not in to_counts]
+    return report
+
+# raises on indices that can't be right before any animation gets built
+def check_glyph_map(mobA, mobB, *glyph_map) -> None:
+    report = validate_glyph_map(mobA, mobB, *glyph_map)
+    if report.out_of_range_from or report.out_of_range_to:
+        raise IndexError(
+            f"glyph map has from indices {report.out_of_range_from} and to indices {report.out_of_range_to} "
+            f"out of range for {report.n_from} -> {report.n_to} glyphs"
+        )
+    if report.repeated_within_entry:
+        raise ValueError(f"glyph map entries {report.repeated_within_entry} repeat indices")
+
+
+# glyphs with the same shape get the same key, wherever they are and whatever their size
+def glyph_shape_key(glyph: VMobject, decimals: int = 2) -> str:
+    points = glyph.get_all_points()
+    if len(points) == 0:
+        return "empty"
+    size = max(glyph.width, glyph.height) or 1
+    normalized = np.round((points - glyph.get_center()) / size, decimals) + 0.0
+    return hashlib.sha1(normalized.tobytes()).hexdigest()
+
+# pairs up glyphs of the same shape in order, glyphs without a partner fade out or in
+def suggest_glyph_map(mobA, mobB, decimals: int = 2) -> list:
+    sources = defaultdict(deque)
+    for i, glyph in enumerate(mobA[0]):
+        sources[glyph_shape_key(glyph, decimals)].append(i)
+
+    glyph_map = []
+    faded_in = []
+    for j, glyph in enumerate(mobB[0]):
+        candidates = sources[glyph_shape_key(glyph, decimals)]
+        if candidates:
+            glyph_map.append(([candidates.popleft()], [j]))
+        else:
+            faded_in.append(j)
+    faded_out = sorted(i for candidates in sources.values() for i in candidates)
+
+    if faded_out:
+        glyph_map.append((faded_out, []))
+    if faded_in:
+        glyph_map.append(([], faded_in))
+    return glyph_map
+
 
 class TransformByGlyphMap(AnimationGroup):
-    def __init__(self, mobA, mobB, *glyph_map, replace=True, from_copy=False, show_indices=False, **kwargs):
+    def __init__(self, mobA, mobB, *glyph_map, replace=True, from_copy=False, show_indices=False, fused=False, **kwargs):
 		# replace=False does not work properly
         if from_copy:
             self.mobA = mobA.copy()
@@ -17,58 +120,163 @@ class TransformByGlyphMap(AnimationGroup):
         self.glyph_map = glyph_map
         self.show_indices = show_indices
 
-        animations = []
-        mentioned_from_indices = []
-        mentioned_to_indices = []
+        check_glyph_map(self.mobA, self.mobB, *self.glyph_map)
+        shift = self.mobB.get_center() - self.mobA.get_center()
+
+        # (source, target) glyph groups, None on one side for fades
+        steps = []
+        mentioned_from_indices = set()
+        mentioned_to_indices = set()
         for from_indices, to_indices in self.glyph_map:
-            print(from_indices, to_indices)
+            logger.debug("%s -> %s", from_indices, to_indices)
             if len(from_indices) == 0 and len(to_indices) == 0:
                 self.show_indices = True
                 continue
             elif len(to_indices) == 0:
-                animations.append(FadeOut(
-                    VGroup(*[self.mobA[0][i] for i in from_indices]),
-                    shift = self.mobB.get_center()-self.mobA.get_center()
-                ))
+                steps.append((VGroup(*[self.mobA[0][i] for i in from_indices]), None))
             elif len(from_indices) == 0:
-                animations.append(FadeIn(
-                    VGroup(*[self.mobB[0][j] for j in to_indices]),
-                    shift = self.mobB.get_center() - self.mobA.get_center()
-                ))
+                steps.append((None, VGroup(*[self.mobB[0][j] for j in to_indices])))
             else:
-                animations.append(Transform(
+                # only glyphs that already went somewhere else need a copy
+                steps.append((
                     VGroup(*[self.mobA[0][i].copy() if i in mentioned_from_indices else self.mobA[0][i] for i in from_indices]),
-                    VGroup(*[self.mobB[0][j] for j in to_indices]),
-                    replace_mobject_with_target_in_scene=self.replace
+                    VGroup(*[self.mobB[0][j] for j in to_indices])
                 ))
-            mentioned_from_indices.extend(from_indices)
-            mentioned_to_indices.extend(to_indices)
+            mentioned_from_indices.update(from_indices)
+            mentioned_to_indices.update(to_indices)
 
-        print(mentioned_from_indices, mentioned_to_indices)
-        remaining_from_indices = list(set(range(len(self.mobA[0]))) - set(mentioned_from_indices))
-        remaining_from_indices.sort()
-        remaining_to_indices = list(set(range(len(self.mobB[0]))) - set(mentioned_to_indices))
-        remaining_to_indices.sort()
-        print(remaining_from_indices, remaining_to_indices)
+        remaining_from_indices = sorted(set(range(len(self.mobA[0]))) - mentioned_from_indices)
+        remaining_to_indices = sorted(set(range(len(self.mobB[0]))) - mentioned_to_indices)
+        logger.debug("remaining from indices: %s", remaining_from_indices)
+        logger.debug("remaining to indices: %s", remaining_to_indices)
 
         #I don't know what the first condition of this line does but it kinda breaks the animation sometimes so I just removed it
         #if len(remaining_from_indices) == len(remaining_to_indices) and not self.show_indices:
 
         if not self.show_indices:
             for from_index, to_index in zip(remaining_from_indices, remaining_to_indices):
-                animations.append(Transform(
-                    self.mobA[0][from_index],
-                    self.mobB[0][to_index],
-                    replace_mobject_with_target_in_scene=self.replace
-                ))
+                steps.append((self.mobA[0][from_index], self.mobB[0][to_index]))
+
+            if fused:
+                animations = self.fuse_steps(steps, shift)
+            else:
+                animations = []
+                for source, target in steps:
+                    if target is None:
+                        animations.append(FadeOut(source, shift=shift))
+                    elif source is None:
+                        animations.append(FadeIn(target, shift=shift))
+                    else:
+                        animations.append(Transform(
+                            source, target, replace_mobject_with_target_in_scene=self.replace
+                        ))
             super().__init__(*animations, **kwargs)
         else:
-            print(f"From indices: {len(remaining_from_indices)}    To indices: {len(remaining_to_indices)}")
-            print("Showing indices...")
+            logger.info("From indices: %d    To indices: %d", len(remaining_from_indices), len(remaining_to_indices))
+            logger.info("Showing indices...")
             super().__init__(
                 Create(index_labels(self.mobA[0], color=PINK)),
                 FadeIn(self.mobB.next_to(self.mobA, DOWN), shift=DOWN),
                 Create(index_labels(self.mobB[0], color=PINK)),
                 Wait(5),
                 lag_ratio=0.5
-                )
\ No newline at end of file
+                )
+
+    # one FadeOut, one FadeIn and one FusedGlyphTransform instead of an animation per glyph group
+    def fuse_steps(self, steps, shift) -> list:
+        fade_outs = [source for source, target in steps if target is None]
+        fade_ins = [target for source, target in steps if source is None]
+        pairs = [(source, target) for source, target in steps if source is not None and target is not None]
+        animations = []
+        if fade_outs:
+            animations.append(FadeOut(VGroup(*fade_outs), shift=shift))
+        if fade_ins:
+            animations.append(FadeIn(VGroup(*fade_ins), shift=shift))
+        if pairs:
+            animations.append(FusedGlyphTransform(pairs, replace=self.replace))
+        return animations
+
+
+class FusedGlyphTransform(Animation):
+    # morphs every (source, target) glyph group pair at once: the points and colors of all the
+    # glyphs are views into one flat array, so each frame is a single vectorized interpolation
+    channels = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+    def __init__(self, pairs, replace=True, **kwargs):
+        self.sources = [source for source, _ in pairs]
+        self.targets = [target for _, target in pairs]
+        self.replace = replace
+        super().__init__(VGroup(*self.sources), **kwargs)
+
+    @classmethod
+    def is_aligned(cls, source, target) -> bool:
+        source_family, target_family = source.get_family(), target.get_family()
+        return len(source_family) == len(target_family) and all(
+            getattr(a, channel).shape == getattr(b, channel).shape
+            for a, b in zip(source_family, target_family) for channel in cls.channels
+        )
+
+    def create_starting_mobject(self):
+        # the start state lives in self.start_values, there's no need to copy the glyphs
+        return self.mobject
+
+    def begin(self) -> None:
+        self.members = []
+        self.stroke_widths = []
+        start, end = [], []
+        for source, target in zip(self.sources, self.targets):
+            # align_data changes both sides, so only targets that need it get copied
+            if not self.is_aligned(source, target):
+                target = target.copy()
+                source.align_data(target)
+            for mob, goal in zip(source.get_family(), target.get_family()):
+                self.members.append(mob)
+                start.extend(getattr(mob, channel).ravel() for channel in self.channels)
+                end.extend(getattr(goal, channel).ravel() for channel in self.channels)
+                if mob.stroke_width != goal.stroke_width or mob.background_stroke_width != goal.background_stroke_width:
+                    self.stroke_widths.append((
+                        mob, mob.stroke_width, goal.stroke_width,
+                        mob.background_stroke_width, goal.background_stroke_width
+                    ))
+
+        self.start_values = np.concatenate(start) if start else np.zeros(0)
+        self.deltas = (np.concatenate(end) if end else np.zeros(0)) - self.start_values
+        self.buffer = self.start_values.copy()
+        offset = 0
+        for mob in self.members:
+            for channel in self.channels:
+                shape = getattr(mob, channel).shape
+                size = int(np.prod(shape))
+                setattr(mob, channel, self.buffer[offset:offset + size].reshape(shape))
+                offset += size
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha)
+        np.multiply(self.deltas, t, out=self.buffer)
+        self.buffer += self.start_values
+        for mob, width_a, width_b, background_a, background_b in self.stroke_widths:
+            mob.stroke_width = interpolate(width_a, width_b, t)
+            mob.background_stroke_width = interpolate(background_a, background_b, t)
+
+    def finish(self) -> None:
+        super().finish()
+        # the glyphs get their own arrays back so nothing keeps sharing the buffer
+        for mob in self.members:
+            for channel in self.channels:
+                setattr(mob, channel, getattr(mob, channel).copy())
+
+    def clean_up_from_scene(self, scene) -> None:
+        super().clean_up_from_scene(scene)
+        if self.replace:
+            scene.replace(self.mobject, VGroup(*self.targets))
+
+
+# python transform_by_glyph_map.py "<tex from>" "<tex to>" prints a suggested glyph map
+if __name__ == "__main__":
+    import sys
+
+    mobA, mobB = MathTex(sys.argv[1]), MathTex(sys.argv[2])
+    suggestion = suggest_glyph_map(mobA, mobB)
+    print(validate_glyph_map(mobA, mobB, *suggestion))
+    print(",\n".join(str(entry) for entry in suggestion))
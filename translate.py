@@ -0,0 +1,29 @@
+from manim import *
+
+import numpy as np
+
+
+class Translate(Animation):
+    # moves a mobject to target_point by shifting its points in place every frame, where
+    # mobject.animate.move_to would copy the whole mobject to build the target
+    def __init__(self, mobject: Mobject, target_point: np.ndarray, path_arc: float = 0, **kwargs):
+        super().__init__(mobject, **kwargs)
+        self.target_point = np.array(target_point, dtype=float)
+        self.path_func = path_along_arc(path_arc)
+
+    # nothing is read back from the starting mobject, so there's no need to copy it
+    def create_starting_mobject(self) -> Mobject:
+        return self.mobject
+
+    def begin(self) -> None:
+        self.start_point = self.mobject.get_center()
+        self.current_point = self.start_point
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        point = self.path_func(self.start_point, self.target_point, self.rate_func(alpha))
+        delta = point - self.current_point
+        # Mobject.shift copies every member's points as floats first, this adds to them in place
+        for mob in self.mobject.family_members_with_points():
+            mob.points += delta
+        self.current_point = point